@@ -1,17 +1,24 @@
 import json
 import logging
+import mmap
+import os
+import re
+import sys
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 import dspy
+import jinja2
+import orjson
 from genji import LLMBackend as GenjiBackend
 from genji import Template as GenjiTemplate
+from pydantic import TypeAdapter, ValidationError
 
 from ..gcs.models import JobResult, StepResult
 from ..parsing.xunit_models import FailedTest
 from ..security.leak_detector import LeakDetector
-from ..utils import retry_with_backoff
+from ..utils import retry_with_backoff, translate_newlines
 from .signatures import AnalyzeStepFailure, AnalyzeTestFailure, GenerateRCA
 
 logger = logging.getLogger(__name__)
@@ -22,6 +29,33 @@ def _estimate_tokens(text: str) -> int:
     return len(text) // 4
 
 
+def _serialize_context(data: Any) -> str:
+    """Serialize synthesis context as indented JSON for the RCA prompt."""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+
+
+# Matches JSON string values (content between quotes, handling escapes)
+_JSON_STRING_RE = re.compile(r'"((?:[^"\\]|\\.)*)(?<!\\)"')
+
+# Any raw control character; without one there is nothing to sanitize
+_CONTROL_CHAR_RE = re.compile(r"[\x00-\x1f]")
+
+# Escapes literal newlines/tabs/carriage returns and drops all other control characters
+_CONTROL_CHAR_TABLE = str.maketrans(
+    {
+        **{chr(c): None for c in range(0x20)},
+        "\n": "\\n",
+        "\r": "\\r",
+        "\t": "\\t",
+    }
+)
+
+
+def _escape_control_chars(match: re.Match[str]) -> str:
+    """Escape control characters inside a matched JSON string value."""
+    return f'"{match.group(1).translate(_CONTROL_CHAR_TABLE)}"'
+
+
 def _sanitize_json_string(text: str) -> str:
     """Sanitize JSON string by escaping unescaped control characters.
 
@@ -29,19 +63,9 @@ def _sanitize_json_string(text: str) -> str:
     properly escaped \\n and \\t sequences. This causes json.loads() to fail with
     "Invalid control character" errors.
     """
-    import re
-
-    # Find all string values in the JSON and escape control characters within them
-    # This regex matches JSON string values (content between quotes, handling escapes)
-    def escape_control_chars(match: re.Match[str]) -> str:
-        content = match.group(1)
-        content = content.replace("\n", "\\n")
-        content = content.replace("\r", "\\r")
-        content = content.replace("\t", "\\t")
-        content = re.sub(r"[\x00-\x08\x0b\x0c\x0e-\x1f]", "", content)
-        return f'"{content}"'
-
-    return re.sub(r'"((?:[^"\\]|\\.)*)(?<!\\)"', escape_control_chars, text)
+    if not _CONTROL_CHAR_RE.search(text):
+        return text
+    return _JSON_STRING_RE.sub(_escape_control_chars, text)
 
 
 @dataclass
@@ -71,6 +95,22 @@ class ArtifactAnalysis:
     key_findings: str
 
 
+# Parses and validates the rendered artifact findings JSON in one pass
+_ARTIFACT_FINDINGS_ADAPTER = TypeAdapter(list[ArtifactAnalysis])
+
+# Report markdown template, compiled once at import and reused for every render
+_TEMPLATES_DIR = Path(__file__).parent / "templates"
+_JINJA_ENV = jinja2.Environment(
+    loader=jinja2.FileSystemLoader(_TEMPLATES_DIR),
+    autoescape=False,
+    auto_reload=False,
+    trim_blocks=True,
+    lstrip_blocks=True,
+    keep_trailing_newline=True,
+)
+_RCA_REPORT_TEMPLATE = _JINJA_ENV.get_template("rca_report.md.jinja")
+
+
 @dataclass
 class RCAReport:
     """Complete root cause analysis report."""
@@ -86,56 +126,24 @@ class RCAReport:
     artifact_analyses: list[ArtifactAnalysis] = field(default_factory=list)
     contributing_artifact_paths: list[str] = field(default_factory=list)
 
-    def to_markdown(self) -> str:
-        """Generate markdown formatted report with leak detection."""
-        parts = [
-            "# Pipeline Failure Analysis\n",
-            f"**Job:** `{self.job_name}`\n",
-            f"**Build:** `{self.build_id}`",
-        ]
+    def _contributing_artifacts(self) -> list[ArtifactAnalysis]:
+        """Get LLM-ranked contributing artifacts that have meaningful findings."""
+        if not self.contributing_artifact_paths:
+            return []
 
-        if self.pr_number:
-            parts.append(f" | **PR:** #{self.pr_number}")
-        parts.append(f" | **Category:** {self.category.title()}")
-
-        parts.extend(["\n\n---\n", "## Root Cause\n\n", f"{self.summary}\n\n"])
-        parts.extend(["## Technical Details\n\n", f"{self.detailed_analysis}\n\n"])
-
-        if self.step_analyses:
-            parts.append("## Evidence\n\n")
-            for analysis in self.step_analyses:
-                parts.append(f"**{analysis.step_name}** — *{analysis.failure_category}*\n\n")
-                if analysis.evidence:
-                    for item in analysis.evidence:
-                        # Evidence is now a dict with 'source' and 'content'
-                        source = item.get("source", "unknown")
-                        content = item.get("content", "").replace("`", "'").strip()
-
-                        # Use expandable details - only show source in summary
-                        parts.append(f"<details>\n<summary><code>{source}</code></summary>\n\n")
-                        parts.append(f"```\n{content}\n```\n</details>\n\n")
-
-        # Add LLM-ranked contributing factors from artifact analyses (within Evidence section)
-        if self.contributing_artifact_paths:
-            artifact_lookup = {a.artifact_path: a for a in self.artifact_analyses}
-            contributing = [
-                artifact_lookup[path]
-                for path in self.contributing_artifact_paths
-                if path in artifact_lookup
-                and artifact_lookup[path].key_findings
-                and "no significant findings" not in artifact_lookup[path].key_findings.lower()
-                and "analysis failed" not in artifact_lookup[path].key_findings.lower()
-            ]
-            if contributing:
-                if not self.step_analyses:
-                    parts.append("## Evidence\n\n")
-                parts.append("### Contributing Factors\n\n")
-                for artifact in contributing:
-                    findings = artifact.key_findings.replace("`", "'").strip()
-                    parts.append(f"<details>\n<summary><code>{artifact.artifact_path}</code></summary>\n\n")
-                    parts.append(f"{findings}\n</details>\n\n")
+        artifact_lookup = {a.artifact_path: a for a in self.artifact_analyses}
+        return [
+            artifact_lookup[path]
+            for path in self.contributing_artifact_paths
+            if path in artifact_lookup
+            and artifact_lookup[path].key_findings
+            and "no significant findings" not in artifact_lookup[path].key_findings.lower()
+            and "analysis failed" not in artifact_lookup[path].key_findings.lower()
+        ]
 
-        markdown_output = "".join(parts)
+    def to_markdown(self) -> str:
+        """Generate markdown formatted report with leak detection."""
+        markdown_output = _RCA_REPORT_TEMPLATE.render(report=self, contributing=self._contributing_artifacts())
 
         # Sanitize the entire markdown output to prevent secret leaks
         leak_detector = LeakDetector()
@@ -210,7 +218,14 @@ class FailureAnalyzer(dspy.Module):
             return "(No log content available)"
 
         try:
-            return Path(step.log_path).read_text()
+            with open(step.log_path, "rb") as f:
+                # mmap cannot map an empty file
+                if os.fstat(f.fileno()).st_size == 0:
+                    return ""
+                # Decode straight from the map so no full bytes copy of a large log is
+                # held alongside the decoded string
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return translate_newlines(str(mm, "utf-8", "replace"))
         except Exception as e:
             logger.error(f"Failed to read log from {step.log_path}: {e}")
             return "(No log content available)"
@@ -361,6 +376,32 @@ class FailureAnalyzer(dspy.Module):
 
         return batches
 
+    def _parse_artifact_findings(self, rendered: str) -> list[ArtifactAnalysis]:
+        """Parse rendered artifact findings JSON into ArtifactAnalysis objects.
+
+        Args:
+            rendered: JSON array of {"artifact_path": ..., "key_findings": ...} objects
+
+        Returns:
+            List of ArtifactAnalysis objects
+
+        Raises:
+            KeyError: If a finding is missing a required field
+            ValueError: If the content is not a valid JSON array of findings
+        """
+        try:
+            findings = _ARTIFACT_FINDINGS_ADAPTER.validate_json(rendered)
+        except ValidationError as e:
+            for error in e.errors():
+                if error["type"] == "missing":
+                    raise KeyError(error["loc"][-1]) from e
+            raise ValueError(f"Invalid artifact findings: {e}") from e
+
+        # The same artifact paths recur across batches, findings and report lookups
+        for finding in findings:
+            finding.artifact_path = sys.intern(finding.artifact_path)
+        return findings
+
     def _analyze_artifact_batch(self, batch: dict[str, str], batch_num: int) -> list[ArtifactAnalysis]:
         """Analyze a batch of artifacts using Genji template rendering.
 
@@ -393,19 +434,11 @@ class FailureAnalyzer(dspy.Module):
 
         try:
             template = GenjiTemplate.from_file(
-                Path(__file__).parent / "templates" / "artifact_analysis.json.genji",
+                _TEMPLATES_DIR / "artifact_analysis.json.genji",
                 backend=self._genji_backend,
             )
             rendered = template.render(artifacts=batch)
-            findings_list = json.loads(rendered)
-
-            return [
-                ArtifactAnalysis(
-                    artifact_path=finding["artifact_path"],
-                    key_findings=finding["key_findings"],
-                )
-                for finding in findings_list
-            ]
+            return self._parse_artifact_findings(rendered)
         except Exception as e:
             logger.error(f"Artifact batch {batch_num}: analysis failed: {e}")
             return [
@@ -443,7 +476,7 @@ class FailureAnalyzer(dspy.Module):
             "note": "Supplemental diagnostic artifacts providing system/cluster context.",
             "analyses": [
                 {
-                    "artifact_path": a.artifact_path,
+                    "artifact_path": sys.intern(a.artifact_path),
                     "key_findings": a.key_findings,
                 }
                 for a in artifact_analyses
@@ -481,7 +514,7 @@ class FailureAnalyzer(dspy.Module):
         artifact_count = len(artifacts_dict.get("analyses", []))
         logger.info(f"Synthesis: {len(steps_dict)} steps, {len(tests_dict)} tests, {artifact_count} artifacts")
 
-        return json.dumps(steps_dict, indent=2), json.dumps(tests_dict, indent=2), json.dumps(artifacts_dict, indent=2)
+        return _serialize_context(steps_dict), _serialize_context(tests_dict), _serialize_context(artifacts_dict)
 
     def _create_error_report(
         self,
@@ -1,6 +1,8 @@
 import fnmatch
+import functools
 import logging
 import os
+import re
 from dataclasses import dataclass, field
 
 from litellm import model_cost
@@ -8,6 +10,62 @@ from litellm import model_cost
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1024)
+def _extract_org_repo_section(job_name: str) -> str | None:
+    """Extract the org-repo section from job name.
+
+    Pure on the job name string, so results are memoized across Config instances.
+    """
+    parts = job_name.split("-")
+
+    if parts[0] == "rehearse":
+        parts = parts[2:]
+
+    if len(parts) < 5 or not (parts[0] in ["pull", "periodic"] and parts[1] == "ci"):
+        return None
+
+    after_prefix = "-".join(parts[2:])
+    branch_indicators = ["-main-", "-master-", "-release-", "-develop-"]
+
+    for indicator in branch_indicators:
+        if indicator in after_prefix:
+            return after_prefix.split(indicator)[0]
+
+    return None
+
+
+def _compile_glob_list(globs: list[str]) -> re.Pattern[str] | None:
+    """Combine fnmatch-style globs into a single alternation regex, or None if there are none."""
+    if not globs:
+        return None
+    return re.compile("|".join(fnmatch.translate(glob) for glob in globs))
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_globs(patterns: tuple[str, ...]) -> re.Pattern[str] | None:
+    """Compile a pattern list once so repeated matches skip per-call glob translation."""
+    return _compile_glob_list([p.strip() for p in patterns if p.strip()])
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_exclusion_globs(
+    patterns: tuple[str, ...],
+) -> tuple[re.Pattern[str] | None, re.Pattern[str] | None]:
+    """Compile exclusion patterns into (exclude, keep) regexes; ! prefixed patterns are keeps."""
+    exclude_pats = []
+    keep_pats = []
+    for p in patterns:
+        p = p.strip()
+        if not p:
+            continue
+        if p.startswith("!"):
+            keep_pats.append(p[1:])
+        else:
+            exclude_pats.append(p)
+
+    return _compile_glob_list(exclude_pats), _compile_glob_list(keep_pats)
+
+
 @dataclass
 class Config:
     """Configuration for the failure analyzer."""
@@ -78,39 +136,20 @@ class Config:
             return False
 
         try:
-            from github import Auth, Github
+            from .output.github import get_github_repo
 
-            auth = Auth.Token(self.github_token)
-            g = Github(auth=auth)
             try:
-                g.get_repo(f"{org}/{repo}")
+                get_github_repo(self.github_token, f"{org}/{repo}")
                 return True
             except Exception:
                 return False
-            finally:
-                g.close()
         except Exception as e:
             logger.debug(f"GitHub check failed: {e}")
             return False
 
     def _extract_org_repo_section(self, job_name: str) -> str | None:
         """Extract the org-repo section from job name."""
-        parts = job_name.split("-")
-
-        if parts[0] == "rehearse":
-            parts = parts[2:]
-
-        if len(parts) < 5 or not (parts[0] in ["pull", "periodic"] and parts[1] == "ci"):
-            return None
-
-        after_prefix = "-".join(parts[2:])
-        branch_indicators = ["-main-", "-master-", "-release-", "-develop-"]
-
-        for indicator in branch_indicators:
-            if indicator in after_prefix:
-                return after_prefix.split(indicator)[0]
-
-        return None
+        return _extract_org_repo_section(job_name)
 
     def _find_valid_org_repo_split(self, org_repo_section: str) -> str | None:
         """Try different dash splits and validate against GitHub."""
@@ -218,17 +257,13 @@ class Config:
 
     def should_ignore_step(self, step_name: str) -> bool:
         """Check if step matches any ignore pattern."""
-        return any(
-            fnmatch.fnmatch(step_name, pattern.strip()) for pattern in self.ignored_steps_patterns if pattern.strip()
-        )
+        regex = _compile_globs(tuple(self.ignored_steps_patterns))
+        return bool(regex and regex.match(step_name))
 
     def should_include_artifact_path(self, artifact_path: str) -> bool:
         """Check if artifact path matches any include pattern."""
-        return any(
-            fnmatch.fnmatch(artifact_path, pattern.strip())
-            for pattern in self.included_artifacts_patterns
-            if pattern.strip()
-        )
+        regex = _compile_globs(tuple(self.included_artifacts_patterns))
+        return bool(regex and regex.match(artifact_path))
 
     def should_exclude_artifact(self, artifact_path: str) -> bool:
         """Check if an artifact path should be excluded based on exclude patterns.
@@ -250,25 +285,15 @@ class Config:
         if not self.excluded_artifacts_patterns:
             return False
 
-        exclude_pats = []
-        keep_pats = []
-        for p in self.excluded_artifacts_patterns:
-            p = p.strip()
-            if not p:
-                continue
-            if p.startswith("!"):
-                keep_pats.append(p[1:])
-            else:
-                exclude_pats.append(p)
-
-        if not exclude_pats:
+        exclude_re, keep_re = _compile_exclusion_globs(tuple(self.excluded_artifacts_patterns))
+        if exclude_re is None:
             return False
 
         components = artifact_path.split("/")
 
-        matches_exclude = any(fnmatch.fnmatch(component, pat) for component in components for pat in exclude_pats)
+        matches_exclude = any(exclude_re.match(component) for component in components)
         if not matches_exclude:
             return False
 
-        matches_keep = any(fnmatch.fnmatch(component, pat) for component in components for pat in keep_pats)
+        matches_keep = keep_re is not None and any(keep_re.match(component) for component in components)
         return not matches_keep
@@ -1,10 +1,14 @@
-import json
+import io
 import logging
+import re
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any
 
+import orjson
 from google.cloud import storage
+from google.cloud.storage import transfer_manager  # type: ignore[import-untyped]
 from google.oauth2 import service_account
 
 from ..parsing.xunit_models import FailedTest
@@ -13,39 +17,70 @@ from .models import FinishedMetadata, JobResult, StageInfo, StepResult
 
 logger = logging.getLogger(__name__)
 
+# XUnit result files: an .xml blob whose path contains one of these fragments (case-insensitive)
+_XUNIT_NAME_RE = re.compile(r"junit|report|/results/|/test-results/", re.IGNORECASE)
+
+# Partial-response projection for listings that only read blob names (keeps pagination working)
+_NAME_ONLY_FIELDS = "items(name),nextPageToken"
+_NAME_AND_PREFIX_FIELDS = "items(name),prefixes,nextPageToken"
+
+# finished.json is a few hundred bytes; anything past this is corrupt and not worth parsing
+_MAX_FINISHED_JSON_BYTES = 1 << 20
+
+# Upper bound on concurrent per-stage listings when walking the artifacts tree
+_MAX_LISTING_WORKERS = 16
+
+# Upper bound on concurrent downloads when fetching a batch of blobs
+_MAX_DOWNLOAD_WORKERS = 16
+
 
 class GCSClient:
     """Client for interacting with GCS bucket containing Prow logs."""
 
-    def __init__(self, bucket_name: str, creds_path: str | None = None, config: Any = None) -> None:
+    def __init__(
+        self,
+        bucket_name: str,
+        creds_path: str | None = None,
+        config: Any = None,
+        *,
+        client: storage.Client | None = None,
+    ) -> None:
         """Initialize GCS client.
 
         Args:
             bucket_name: Name of the GCS bucket
             creds_path: Optional path to service account credentials
             config: Optional Config instance for filtering settings
+            client: Optional existing storage client to reuse; skips credential setup
         """
         self.bucket_name = bucket_name
         self.config = config
-        if creds_path:
+        if client is not None:
+            self.client = client
+        elif creds_path:
             credentials = service_account.Credentials.from_service_account_file(creds_path)
             self.client = storage.Client(credentials=credentials)
         else:
             self.client = storage.Client.create_anonymous_client()
         self.bucket = self.client.bucket(bucket_name)
         self.xunit_parser = XUnitParser()
+        self._step_graph_cache: dict[str, dict[str, Any]] = {}
 
-    def _parse_finished_json(self, content: str) -> FinishedMetadata | None:
+    def _parse_finished_json(self, content: str | bytes) -> FinishedMetadata | None:
         """Parse a finished.json file content.
 
         Args:
-            content: JSON content as string
+            content: JSON content as string or raw bytes
 
         Returns:
             FinishedMetadata object or None if parsing fails
         """
+        if len(content) > _MAX_FINISHED_JSON_BYTES:
+            logger.warning(f"Skipping oversized finished.json ({len(content):,} bytes)")
+            return None
+
         try:
-            data = json.loads(content)
+            data = orjson.loads(content)
             timestamp = datetime.fromtimestamp(data.get("timestamp", 0))
             return FinishedMetadata(
                 timestamp=timestamp,
@@ -75,27 +110,70 @@ class GCSClient:
             logger.debug(f"Failed to check existence of {blob_path}: {e}")
             return False
 
-    def _fetch_blob_text(self, blob_path: str) -> str | None:
-        """Fetch a blob as text.
+    def _fetch_blob_bytes(self, blob_path: str) -> bytes | None:
+        """Fetch a blob's raw content.
 
         Args:
             blob_path: Path to blob in bucket
 
         Returns:
-            Blob content as string or None if not found
+            Blob content as bytes or None if not found
         """
         try:
             blob = self.bucket.blob(blob_path)
-            content: str = blob.download_as_text()
+            content: bytes = blob.download_as_bytes()
             return content
         except Exception as e:
-            # Distinguish between file not found and other errors
-            error_str = str(e)
-            if "404" in error_str or "Not Found" in error_str:
-                logger.debug(f"File not found: {blob_path}")
+            self._log_fetch_error(blob_path, e)
+            return None
+
+    def _fetch_many_blobs(self, blob_paths: list[str]) -> dict[str, bytes | None]:
+        """Fetch several blobs' raw content concurrently.
+
+        Args:
+            blob_paths: Paths to blobs in bucket
+
+        Returns:
+            Dictionary mapping each path to its content, or None if the download failed
+        """
+        buffers = [io.BytesIO() for _ in blob_paths]
+        results = transfer_manager.download_many(
+            [(self.bucket.blob(path), buffer) for path, buffer in zip(blob_paths, buffers, strict=True)],
+            worker_type=transfer_manager.THREAD,
+            max_workers=_MAX_DOWNLOAD_WORKERS,
+        )
+
+        contents: dict[str, bytes | None] = {}
+        for path, buffer, result in zip(blob_paths, buffers, results, strict=True):
+            if isinstance(result, Exception):
+                self._log_fetch_error(path, result)
+                contents[path] = None
             else:
-                logger.warning(f"Failed to fetch {blob_path}: {e}")
+                contents[path] = buffer.getvalue()
+        return contents
+
+    @staticmethod
+    def _log_fetch_error(blob_path: str, error: Exception) -> None:
+        """Log a failed download, distinguishing file not found from other errors."""
+        error_str = str(error)
+        if "404" in error_str or "Not Found" in error_str:
+            logger.debug(f"File not found: {blob_path}")
+        else:
+            logger.warning(f"Failed to fetch {blob_path}: {error}")
+
+    def _fetch_blob_text(self, blob_path: str) -> str | None:
+        """Fetch a blob as text.
+
+        Args:
+            blob_path: Path to blob in bucket
+
+        Returns:
+            Blob content as string or None if not found
+        """
+        content = self._fetch_blob_bytes(blob_path)
+        if content is None:
             return None
+        return content.decode("utf-8", errors="replace")
 
     def _fetch_finished_json(self, base_path: str) -> FinishedMetadata | None:
         """Fetch and parse a finished.json file.
@@ -106,7 +184,7 @@ class GCSClient:
         Returns:
             FinishedMetadata or None
         """
-        content = self._fetch_blob_text(f"{base_path}/finished.json")
+        content = self._fetch_blob_bytes(f"{base_path}/finished.json")
         if content:
             return self._parse_finished_json(content)
         return None
@@ -118,16 +196,26 @@ class GCSClient:
             base_path: Base path to artifacts directory
 
         Returns:
-            Step graph as dictionary
+            Step graph as dictionary, or an empty dict if it could not be fetched or parsed
+            (successfully parsed graphs are cached per base path for the client's lifetime)
         """
-        content = self._fetch_blob_text(f"{base_path}/artifacts/ci-operator-step-graph.json")
-        if content:
-            try:
-                data: dict[str, Any] = json.loads(content)
-                return data
-            except json.JSONDecodeError as e:
-                logger.warning(f"Failed to parse step graph: {e}")
-        return {}
+        cached = self._step_graph_cache.get(base_path)
+        if cached is not None:
+            return cached
+
+        content = self._fetch_blob_bytes(f"{base_path}/artifacts/ci-operator-step-graph.json")
+        if not content:
+            return {}
+
+        try:
+            data: dict[str, Any] = orjson.loads(content)
+        except orjson.JSONDecodeError as e:
+            logger.warning(f"Failed to parse step graph: {e}")
+            return {}
+
+        # Only a parsed graph is cached, so a transient fetch failure is retried next call
+        self._step_graph_cache[base_path] = data
+        return data
 
     def _list_stages(self, base_path: str) -> list[str]:
         """List all stage directories in artifacts.
@@ -230,9 +318,8 @@ class GCSClient:
 
     def _is_xunit_file(self, blob_name: str) -> bool:
         """Check if blob name matches XUnit file patterns."""
-        return blob_name.endswith(".xml") and (
-            "junit" in blob_name or "report" in blob_name or "/results/" in blob_name or "/test-results/" in blob_name
-        )
+        # Cheap suffix check first; most artifacts are not XML and never reach the regex
+        return blob_name[-4:].lower() == ".xml" and _XUNIT_NAME_RE.search(blob_name) is not None
 
     def _should_include_xunit_file(self, blob_path: str) -> bool:
         """Check if XUnit file should be included based on config filters."""
@@ -257,30 +344,65 @@ class GCSClient:
 
         return True
 
-    def _list_xunit_files(self, base_path: str) -> list[str]:
+    def _list_blob_names(self, prefix: str) -> list[str]:
+        """List the names of all blobs under a prefix."""
+        return [blob.name for blob in self.client.list_blobs(self.bucket_name, prefix=prefix, fields=_NAME_ONLY_FIELDS)]
+
+    def _list_artifact_blob_names(self, artifacts_prefix: str) -> list[str]:
+        """List all blob names under the artifacts prefix.
+
+        Lists the top level with a delimiter first, then lists each stage directory
+        concurrently so jobs with many stages don't pay for serial round-trips.
+
+        Args:
+            artifacts_prefix: Prefix of the job's artifacts directory, ending in "/"
+
+        Returns:
+            Blob names: top-level files first, then each stage's blobs in prefix order
+        """
+        top_level = self.client.list_blobs(
+            self.bucket_name, prefix=artifacts_prefix, delimiter="/", fields=_NAME_AND_PREFIX_FIELDS
+        )
+
+        names: list[str] = []
+        stage_prefixes: list[str] = []
+        for page in top_level.pages:
+            names.extend(blob.name for blob in page)
+            stage_prefixes.extend(page.prefixes)
+
+        if stage_prefixes:
+            with ThreadPoolExecutor(max_workers=min(_MAX_LISTING_WORKERS, len(stage_prefixes))) as executor:
+                for stage_names in executor.map(self._list_blob_names, stage_prefixes):
+                    names.extend(stage_names)
+
+        return names
+
+    def _list_xunit_files(self, base_path: str, strict_verify: bool = False) -> list[str]:
         """List all XUnit XML files in artifacts directory.
 
         Args:
             base_path: Base path to job
+            strict_verify: Re-check each listed blob with an existence request. Listing only
+                returns existing objects, so this is off by default.
 
         Returns:
-            List of XUnit file paths that actually exist and are not filtered
+            List of XUnit file paths that are not filtered
         """
         artifacts_prefix = f"{base_path}/artifacts/"
-        blobs = self.client.list_blobs(self.bucket_name, prefix=artifacts_prefix)
 
         xunit_files = []
-        for blob in blobs:
-            if not self._is_xunit_file(blob.name.lower()):
+        for name in self._list_artifact_blob_names(artifacts_prefix):
+            if not self._is_xunit_file(name):
                 continue
 
-            if not self._should_include_xunit_file(blob.name):
+            if not self._should_include_xunit_file(name):
                 continue
 
-            if self._verify_blob_exists(blob.name):
-                xunit_files.append(blob.name)
-            else:
-                logger.warning(f"XUnit file pattern matched but doesn't exist: {blob.name}")
+            if strict_verify and not self._verify_blob_exists(name):
+                logger.warning(f"XUnit file pattern matched but doesn't exist: {name}")
+                continue
+
+            xunit_files.append(name)
 
         return xunit_files
 
@@ -298,30 +420,33 @@ class GCSClient:
             logger.debug("No XUnit files found")
             return []
 
-        logger.info(f"Found {len(xunit_files)} XUnit files (validated)")
+        logger.info(f"Found {len(xunit_files)} XUnit files")
 
         all_failed_tests: list[FailedTest] = []
-        successfully_fetched = 0
+        raw_contents = self._fetch_many_blobs(xunit_files)
 
+        # Raw bytes go straight to the parser, which honours each file's encoding declaration
+        documents: list[tuple[bytes, str]] = []
         for xunit_path in xunit_files:
             # Extract filename for logging
             source_file = xunit_path.split("/")[-1]
 
-            try:
-                content = self._fetch_blob_text(xunit_path)
-                if content:
-                    successfully_fetched += 1
-                    failed_tests = self.xunit_parser.parse_xunit_file(content, source_file)
-                    all_failed_tests.extend(failed_tests)
-                    if failed_tests:
-                        logger.info(f"Found {len(failed_tests)} failed tests in {source_file}")
-                    else:
-                        logger.debug(f"No failed tests in {source_file}")
-                else:
-                    logger.warning(f"Failed to fetch XUnit file: {source_file} (returned None)")
-            except Exception as e:
-                logger.warning(f"Error processing XUnit file {source_file}: {e}")
-                continue
+            raw = raw_contents.get(xunit_path)
+            if raw:
+                documents.append((raw, source_file))
+            else:
+                logger.warning(f"Failed to fetch XUnit file: {source_file} (returned None)")
+        successfully_fetched = len(documents)
+
+        # Parse errors are contained per document, so one bad file never drops the others
+        parsed = self.xunit_parser.parse_many(documents)
+
+        for (_, source_file), failed_tests in zip(documents, parsed, strict=True):
+            all_failed_tests.extend(failed_tests)
+            if failed_tests:
+                logger.info(f"Found {len(failed_tests)} failed tests in {source_file}")
+            else:
+                logger.debug(f"No failed tests in {source_file}")
 
         if successfully_fetched < len(xunit_files):
             logger.warning(f"Only fetched {successfully_fetched}/{len(xunit_files)} XUnit files successfully")
@@ -367,7 +492,7 @@ class GCSClient:
         search_prefix = f"{artifacts_prefix}{dir_part}/"
         logger.debug(f"Fetching files from: {dir_part} (max_depth={max_depth})")
 
-        blobs = self.client.list_blobs(self.bucket_name, prefix=search_prefix)
+        blobs = self.client.list_blobs(self.bucket_name, prefix=search_prefix, fields=_NAME_ONLY_FIELDS)
 
         artifacts = {}
         total = 0
@@ -37,7 +37,7 @@ class StageInfo:
     steps: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class JobResult:
     """Complete job execution result with all failed steps."""
 
@@ -53,6 +53,14 @@ class JobResult:
     timestamp: datetime | None = None
     gcs_path: str = ""
     additional_artifacts: dict[str, str] = field(default_factory=dict)  # path -> content
+    _gcs_base_path: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.is_pr_job:
+            base_path = f"pr-logs/pull/{self.org_repo}/{self.pr_number}/{self.job_name}/{self.build_id}"
+        else:
+            base_path = f"logs/{self.job_name}/{self.build_id}"
+        object.__setattr__(self, "_gcs_base_path", base_path)
 
     @property
     def is_pr_job(self) -> bool:
@@ -61,7 +69,5 @@ class JobResult:
 
     @property
     def gcs_base_path(self) -> str:
-        """Get the GCS base path for this job."""
-        if self.is_pr_job:
-            return f"pr-logs/pull/{self.org_repo}/{self.pr_number}/{self.job_name}/{self.build_id}"
-        return f"logs/{self.job_name}/{self.build_id}"
+        """Get the GCS base path for this job (computed once at construction)."""
+        return self._gcs_base_path
@@ -1,3 +1,4 @@
+import functools
 import logging
 import os
 import sys
@@ -24,22 +25,36 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=8)
+def _build_lm(model: str, api_key: str | None, api_base: str | None) -> dspy.LM:
+    """Build a DSPy LM, reusing the instance for repeated identical settings."""
+    lm_kwargs = {"model": model}
+
+    if api_key:
+        lm_kwargs["api_key"] = api_key
+
+    if api_base:
+        lm_kwargs["api_base"] = api_base
+
+    return dspy.LM(**lm_kwargs)
+
+
 def configure_dspy(config: Config) -> None:
     """Configure DSPy with the specified LLM."""
     logger.info(f"Configuring DSPy with {config.llm_provider}/{config.llm_model}")
 
     model = f"{config.llm_provider}/{config.llm_model}"
-    lm_kwargs = {"model": model}
 
-    if config.llm_api_key:
-        lm_kwargs["api_key"] = config.llm_api_key
+    api_base = config.llm_base_url
+    if not api_base and config.llm_provider == "ollama":
+        api_base = "http://localhost:11434"
 
-    if config.llm_base_url:
-        lm_kwargs["api_base"] = config.llm_base_url
-    elif config.llm_provider == "ollama":
-        lm_kwargs["api_base"] = "http://localhost:11434"
+    lm = _build_lm(model, config.llm_api_key or None, api_base or None)
+    if dspy.settings.lm is lm:
+        logger.debug("DSPy already configured with this LM, skipping reconfiguration")
+        return
 
-    dspy.configure(lm=dspy.LM(**lm_kwargs))
+    dspy.configure(lm=lm)
 
 
 @click.group()
@@ -1,3 +1,5 @@
+import atexit
+import functools
 import logging
 from typing import TYPE_CHECKING
 
@@ -8,6 +10,7 @@ from ..security.leak_detector import LeakDetector
 if TYPE_CHECKING:
     from github.IssueComment import IssueComment
     from github.PullRequest import PullRequest
+    from github.Repository import Repository
 
     from ..analysis.analyzer import RCAReport
 
@@ -16,6 +19,40 @@ logger = logging.getLogger(__name__)
 BOT_COMMENT_MARKER = "## 🤖 Pipeline Failure Analysis"
 
 
+@functools.lru_cache(maxsize=8)
+def get_github_client(github_token: str) -> Github:
+    """Get a shared GitHub client for a token.
+
+    Clients are cached per token so repeated calls reuse one HTTP session
+    instead of reconnecting; each client is closed at interpreter exit.
+
+    Args:
+        github_token: GitHub personal access token
+
+    Returns:
+        Cached Github client
+    """
+    client = Github(auth=Auth.Token(github_token))
+    atexit.register(client.close)
+    return client
+
+
+@functools.lru_cache(maxsize=32)
+def get_github_repo(github_token: str, repo_name: str) -> "Repository":
+    """Get a repository, caching the lookup per token and name.
+
+    Failed lookups raise and are not cached.
+
+    Args:
+        github_token: GitHub personal access token
+        repo_name: Repository in format "org/repo"
+
+    Returns:
+        Cached Repository object
+    """
+    return get_github_client(github_token).get_repo(repo_name)
+
+
 def _find_existing_bot_comment(pr: "PullRequest") -> "IssueComment | None":
     """Find existing bot comment on the PR, if any."""
     for comment in pr.get_issue_comments():
@@ -24,6 +61,39 @@ def _find_existing_bot_comment(pr: "PullRequest") -> "IssueComment | None":
     return None
 
 
+def _build_comment_body(report: "RCAReport") -> str:
+    """Render the PR comment markdown for a report from a list of fragments."""
+    parts = [
+        f"{BOT_COMMENT_MARKER}\n\n",
+        f"**Category:** {report.category.title()}\n\n",
+        f"{report.summary}\n\n",
+        "### 📋 Technical Details\n\n",
+        f"{report.detailed_analysis}\n",
+    ]
+
+    if report.step_analyses:
+        parts.append("\n<details>\n<summary><b>🔍 Evidence</b></summary>\n\n")
+        for analysis in report.step_analyses:
+            parts.append(f"### {analysis.step_name}\n\n")
+            parts.append(f"**Category:** `{analysis.failure_category}`  \n")
+            parts.append(f"**Root Cause:** {analysis.root_cause}\n\n")
+            if analysis.evidence:
+                parts.append("**Logs:**\n\n")
+                for item in analysis.evidence:
+                    source = item.get("source", "unknown")
+                    content = item.get("content", "").replace("`", "'")
+                    # Use details/summary for expandable evidence - only show source in summary
+                    parts.append(
+                        f"<details>\n<summary><code>{source}</code></summary>\n\n```\n{content}\n```\n</details>\n\n"
+                    )
+            parts.append("\n")
+        parts.append("</details>\n")
+
+    repo_url = "https://github.com/redhat-community-ai-tools/prow-failure-analysis"
+    parts.append(f"\n---\n*Analysis powered by [prow-failure-analysis]({repo_url}) | Build: `{report.build_id}`*\n")
+    return "".join(parts)
+
+
 def post_pr_comment(
     github_token: str,
     org_repo: str,
@@ -41,69 +111,24 @@ def post_pr_comment(
     Raises:
         Exception: If posting comment fails
     """
-    github_repo = org_repo.replace("_", "/")
+    # Only the first underscore separates org from repo; repo names may contain underscores
+    github_repo = org_repo if "/" in org_repo else org_repo.replace("_", "/", 1)
     logger.info(f"Posting comment to {github_repo}#{pr_number}")
 
-    auth = Auth.Token(github_token)
-    g = Github(auth=auth)
-
-    try:
-        repo = g.get_repo(github_repo)
-        pr = repo.get_pull(pr_number)
-
-        existing_comment = _find_existing_bot_comment(pr)
-
-        comment_body = f"""## 🤖 Pipeline Failure Analysis
-
-**Category:** {report.category.title()}
-
-{report.summary}
-
-### 📋 Technical Details
-
-{report.detailed_analysis}
-"""
-
-        if report.step_analyses:
-            comment_body += """
-<details>
-<summary><b>🔍 Evidence</b></summary>
-
-"""
-            for analysis in report.step_analyses:
-                comment_body += f"### {analysis.step_name}\n\n"
-                comment_body += f"**Category:** `{analysis.failure_category}`  \n"
-                comment_body += f"**Root Cause:** {analysis.root_cause}\n\n"
-                if analysis.evidence:
-                    comment_body += "**Logs:**\n\n"
-                    for item in analysis.evidence:
-                        source = item.get("source", "unknown")
-                        content = item.get("content", "").replace("`", "'")
-                        # Use details/summary for expandable evidence - only show source in summary
-                        comment_body += (
-                            f"<details>\n<summary><code>{source}</code></summary>\n\n"
-                            f"```\n{content}\n```\n</details>\n\n"
-                        )
-                comment_body += "\n"
-
-            comment_body += "</details>\n"
-
-        repo_url = "https://github.com/redhat-community-ai-tools/prow-failure-analysis"
-        comment_body += f"""
----
-*Analysis powered by [prow-failure-analysis]({repo_url}) | Build: `{report.build_id}`*
-"""
-
-        # Final safety check: sanitize comment body to prevent any secret leaks
-        leak_detector = LeakDetector()
-        sanitized_comment = leak_detector.sanitize_text(comment_body)
-
-        if existing_comment:
-            existing_comment.edit(sanitized_comment)
-            logger.info(f"Updated existing comment (id={existing_comment.id})")
-        else:
-            pr.create_issue_comment(sanitized_comment)
-            logger.info("New comment posted successfully")
-
-    finally:
-        g.close()
+    repo = get_github_repo(github_token, github_repo)
+    pr = repo.get_pull(pr_number)
+
+    existing_comment = _find_existing_bot_comment(pr)
+
+    comment_body = _build_comment_body(report)
+
+    # Final safety check: sanitize comment body to prevent any secret leaks
+    leak_detector = LeakDetector()
+    sanitized_comment = leak_detector.sanitize_text(comment_body)
+
+    if existing_comment:
+        existing_comment.edit(sanitized_comment)
+        logger.info(f"Updated existing comment (id={existing_comment.id})")
+    else:
+        pr.create_issue_comment(sanitized_comment)
+        logger.info("New comment posted successfully")
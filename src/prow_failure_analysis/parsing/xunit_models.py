@@ -1,7 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FailedTest:
     """Represents a failed test case from an XUnit XML file."""
 
@@ -17,22 +17,34 @@ class FailedTest:
     system_out: str | None
     system_err: str | None
     source_file: str
+    _test_identifier: str = field(init=False, repr=False, compare=False)
+    _combined_failure_info: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.class_name:
+            test_identifier = f"{self.class_name}.{self.test_name}"
+        else:
+            test_identifier = self.test_name
+
+        if self.failure_type or self.failure_message:
+            failure_info = f"{self.failure_type or 'Failure'}: {self.failure_message or 'No message'}"
+        elif self.error_type or self.error_message:
+            failure_info = f"{self.error_type or 'Error'}: {self.error_message or 'No message'}"
+        else:
+            failure_info = "Unknown failure"
+
+        object.__setattr__(self, "_test_identifier", test_identifier)
+        object.__setattr__(self, "_combined_failure_info", failure_info)
 
     @property
     def test_identifier(self) -> str:
         """Get the full test identifier (class.name or just name)."""
-        if self.class_name:
-            return f"{self.class_name}.{self.test_name}"
-        return self.test_name
+        return self._test_identifier
 
     @property
     def combined_failure_info(self) -> str:
         """Combine failure/error type and message."""
-        if self.failure_type or self.failure_message:
-            return f"{self.failure_type or 'Failure'}: {self.failure_message or 'No message'}"
-        if self.error_type or self.error_message:
-            return f"{self.error_type or 'Error'}: {self.error_message or 'No message'}"
-        return "Unknown failure"
+        return self._combined_failure_info
 
     @property
     def combined_details(self) -> str:
@@ -1,10 +1,172 @@
+import io
 import logging
+import os
+import re
+import sys
 import xml.etree.ElementTree as ElementTree
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
 
 from .xunit_models import FailedTest
 
+# lxml is a runtime dependency; the stdlib parser remains as a fallback where it can't be installed
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
 logger = logging.getLogger(__name__)
 
+# Encoding pseudo-attribute of a leading XML declaration, which str input has already been decoded past
+_XML_DECLARED_ENCODING_RE = re.compile(r"""\A(\ufeff?<\?xml[^>]*?\sencoding\s*=\s*)(["'])[^"']*\2""")
+
+# lxml parser options: no entity expansion or network access, no libxml2 size limits, no xml:id table
+_LXML_PARSE_OPTIONS: dict[str, Any] = {
+    "resolve_entities": False,
+    "no_network": True,
+    "huge_tree": True,
+    "collect_ids": False,
+}
+
+# Below this much XML in total, worker start-up costs more than parallel parsing saves
+_MIN_PARALLEL_PARSE_BYTES = 4 << 20
+
+# Exceptions raised for malformed XML by whichever parser is active
+_XML_PARSE_ERRORS: tuple[type[Exception], ...] = (
+    (ElementTree.ParseError, lxml_etree.XMLSyntaxError) if lxml_etree is not None else (ElementTree.ParseError,)
+)
+
+
+# Direct testcase children whose attributes and leading text are captured
+_CAPTURED_CHILD_TAGS = frozenset({"failure", "error", "system-out", "system-err"})
+
+
+class _FailedTestTarget:
+    """Parser target that builds FailedTest objects straight from parse events.
+
+    No element tree is built: only open testcases and the first failure, error,
+    system-out and system-err child of each are tracked. Captured text matches
+    ElementTree's ``.text``, i.e. the text before the child's first subelement.
+    """
+
+    def __init__(self, source_path: str) -> None:
+        self.source_path = source_path
+        self.failed_tests: list[FailedTest] = []
+        self._depth = 0
+        # Open testcases as (depth, attributes, captured children by tag)
+        self._testcases: list[tuple[int, dict[str, str], dict[str, tuple[dict[str, str], str | None]]]] = []
+        self._capture_tag: str | None = None
+        self._capture_attrib: dict[str, str] = {}
+        self._capture_text: list[str] = []
+
+    def start(self, tag: str, attrib: dict[str, str]) -> None:
+        """Track testcases and start capturing their failure/error/output children."""
+        self._depth += 1
+        # A subelement ends the captured element's leading text
+        self._finish_capture()
+
+        if tag == "testcase":
+            self._testcases.append((self._depth, attrib, {}))
+        elif tag in _CAPTURED_CHILD_TAGS and self._testcases:
+            testcase_depth, _, children = self._testcases[-1]
+            if self._depth == testcase_depth + 1 and tag not in children:
+                self._capture_tag = tag
+                self._capture_attrib = attrib
+                self._capture_text = []
+
+    def data(self, text: str) -> None:
+        """Collect text for the element being captured."""
+        if self._capture_tag is not None:
+            self._capture_text.append(text)
+
+    def end(self, tag: str) -> None:
+        """Finish captures and emit a FailedTest when a failing testcase closes."""
+        self._finish_capture()
+
+        if tag == "testcase" and self._testcases and self._testcases[-1][0] == self._depth:
+            _, attrib, children = self._testcases.pop()
+            self.add_testcase(attrib, children)
+        self._depth -= 1
+
+    def close(self) -> list[FailedTest]:
+        """Return the collected failed tests once parsing completes."""
+        return self.failed_tests
+
+    def _finish_capture(self) -> None:
+        """Record the captured child's attributes and leading text on its testcase."""
+        if self._capture_tag is None:
+            return
+        self._testcases[-1][2][self._capture_tag] = (self._capture_attrib, "".join(self._capture_text))
+        self._capture_tag = None
+
+    def add_testcase(self, attrib: dict[str, str], children: dict[str, tuple[dict[str, str], str | None]]) -> None:
+        """Append a FailedTest for a closed testcase that has a failure or error child.
+
+        Args:
+            attrib: Testcase attributes
+            children: Attributes and leading text of the first captured child per tag
+        """
+        failure = children.get("failure")
+        error = children.get("error")
+        if failure is None and error is None:
+            return
+
+        system_out = children.get("system-out")
+        system_err = children.get("system-err")
+        self.failed_tests.append(
+            FailedTest(
+                test_name=attrib.get("name", "unknown"),
+                class_name=_intern(attrib.get("classname")),
+                test_id=attrib.get("id"),
+                failure_type=_intern(failure[0].get("type")) if failure else None,
+                failure_message=failure[0].get("message") if failure else None,
+                failure_content=_clean_text(failure[1]) if failure else None,
+                error_type=_intern(error[0].get("type")) if error else None,
+                error_message=error[0].get("message") if error else None,
+                error_content=_clean_text(error[1]) if error else None,
+                system_out=_clean_text(system_out[1]) if system_out else None,
+                system_err=_clean_text(system_err[1]) if system_err else None,
+                source_file=self.source_path,
+            )
+        )
+
+
+def _intern(value: str | None) -> str | None:
+    """Intern attribute values that repeat across testcases, such as class names and failure types."""
+    return sys.intern(value) if value is not None else None
+
+
+def _clean_text(text: str | None) -> str | None:
+    """Strip captured element text, mapping empty or whitespace-only text to None."""
+    if not text or text.isspace():
+        return None
+    return text.strip()
+
+
+def _may_contain_failures(data: bytes) -> bool:
+    """Cheaply rule out documents that cannot contain failure or error elements.
+
+    A byte scan for the start tags runs far faster than any XML parse. Documents
+    in a UTF-16/32 encoding (NUL bytes up front) can't be scanned this way and
+    are always treated as possibly failing.
+
+    Args:
+        data: XML document as bytes
+
+    Returns:
+        False only if neither a failure nor an error start tag appears anywhere
+    """
+    if b"\x00" in data[:4]:
+        return True
+    return b"<failure" in data or b"<error" in data
+
+
+def _parse_one(document: tuple[bytes, str]) -> list[FailedTest]:
+    """Parse one (data, source_path) pair; module-level so worker processes can run it."""
+    data, source_path = document
+    return XUnitParser().parse_xunit_bytes(data, source_path)
+
 
 class XUnitParser:
     """Parser for XUnit/JUnit XML test result files."""
@@ -19,111 +181,95 @@ class XUnitParser:
         Returns:
             List of FailedTest objects for tests with failures or errors
         """
-        failed_tests: list[FailedTest] = []
+        # The text is re-encoded as UTF-8, so the declaration has to say so too
+        content = _XML_DECLARED_ENCODING_RE.sub(r'\1"UTF-8"', content, count=1)
+        return self.parse_xunit_bytes(content.encode("utf-8"), source_path)
 
-        try:
-            root = ElementTree.fromstring(content)
-        except ElementTree.ParseError as e:
-            logger.warning(f"Failed to parse XML from {source_path}: {e}")
-            return failed_tests
+    def parse_xunit_bytes(self, data: bytes, source_path: str) -> list[FailedTest]:
+        """Parse raw XUnit XML bytes and extract failed test cases.
 
-        # Find all testcase elements (can be direct children or nested in testsuite)
-        testcases = root.findall(".//testcase")
+        The document's own encoding declaration is honoured, so callers holding
+        downloaded bytes can skip decoding to str first.
 
-        for testcase in testcases:
-            # Check if this testcase has a failure or error
-            failure = testcase.find("failure")
-            error = testcase.find("error")
+        Args:
+            data: XML document as bytes
+            source_path: Path to the source file (for reference in results)
+
+        Returns:
+            List of FailedTest objects for tests with failures or errors
+        """
+        if not _may_contain_failures(data):
+            logger.debug(f"No failure or error elements in {source_path}")
+            return []
 
-            if failure is not None or error is not None:
-                failed_test = self._extract_failed_test(testcase, failure, error, source_path)
-                if failed_test:
-                    failed_tests.append(failed_test)
+        try:
+            failed_tests = self._parse_failed_tests(data, source_path)
+        except _XML_PARSE_ERRORS as e:
+            logger.warning(f"Failed to parse XML from {source_path}: {e}")
+            return []
+        except Exception as e:
+            # A malformed report must not take down the other files parsed alongside it
+            logger.warning(f"Error processing XUnit file {source_path}: {e}")
+            return []
 
         logger.debug(f"Parsed {len(failed_tests)} failed tests from {source_path}")
         return failed_tests
 
-    def _extract_failed_test(
-        self,
-        testcase: ElementTree.Element,
-        failure: ElementTree.Element | None,
-        error: ElementTree.Element | None,
-        source_path: str,
-    ) -> FailedTest | None:
-        """Extract a FailedTest from a testcase element.
+    def parse_many(self, documents: list[tuple[bytes, str]]) -> list[list[FailedTest]]:
+        """Parse several XUnit files, spreading large batches across worker processes.
+
+        Small batches, and any batch on a single-CPU host, are parsed in-process,
+        since starting workers and pickling content would outweigh the parse itself.
 
         Args:
-            testcase: The testcase XML element
-            failure: The failure element (if present)
-            error: The error element (if present)
-            source_path: Path to the source XML file
+            documents: (data, source_path) pairs of raw XML bytes
 
         Returns:
-            FailedTest object or None if extraction fails
+            Failed tests for each document, in input order
         """
+        total_bytes = sum(len(data) for data, _ in documents)
+        workers = min(len(documents), os.cpu_count() or 1)
+        if workers < 2 or total_bytes < _MIN_PARALLEL_PARSE_BYTES:
+            return [self.parse_xunit_bytes(data, source_path) for data, source_path in documents]
+
+        logger.debug(f"Parsing {len(documents)} XUnit files ({total_bytes:,} bytes) with {workers} workers")
         try:
-            # Extract testcase attributes
-            test_name = testcase.get("name", "unknown")
-            class_name = testcase.get("classname")
-            test_id = testcase.get("id")
-
-            # Extract failure information
-            failure_type = None
-            failure_message = None
-            failure_content = None
-            if failure is not None:
-                failure_type = failure.get("type")
-                failure_message = failure.get("message")
-                failure_content = self._get_element_text(failure)
-
-            # Extract error information
-            error_type = None
-            error_message = None
-            error_content = None
-            if error is not None:
-                error_type = error.get("type")
-                error_message = error.get("message")
-                error_content = self._get_element_text(error)
-
-            # Extract system-out and system-err
-            system_out_elem = testcase.find("system-out")
-            system_out = self._get_element_text(system_out_elem) if system_out_elem is not None else None
-
-            system_err_elem = testcase.find("system-err")
-            system_err = self._get_element_text(system_err_elem) if system_err_elem is not None else None
-
-            return FailedTest(
-                test_name=test_name,
-                class_name=class_name,
-                test_id=test_id,
-                failure_type=failure_type,
-                failure_message=failure_message,
-                failure_content=failure_content,
-                error_type=error_type,
-                error_message=error_message,
-                error_content=error_content,
-                system_out=system_out,
-                system_err=system_err,
-                source_file=source_path,
-            )
-        except Exception as e:
-            logger.warning(f"Failed to extract test case from {source_path}: {e}")
-            return None
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(_parse_one, documents))
+        except (BrokenProcessPool, OSError) as e:
+            logger.warning(f"Parallel XUnit parsing failed ({e}), parsing sequentially")
+            return [self.parse_xunit_bytes(data, source_path) for data, source_path in documents]
 
-    def _get_element_text(self, element: ElementTree.Element | None) -> str | None:
-        """Safely extract text content from an XML element.
+    def _parse_failed_tests(self, data: bytes, source_path: str) -> list[FailedTest]:
+        """Collect FailedTest objects for testcases with a failure or error.
+
+        With lxml, parse events go straight to a _FailedTestTarget and no tree
+        is built. With the stdlib parser, testcases are streamed and cleared.
 
         Args:
-            element: XML element
+            data: XML document as bytes
+            source_path: Path to the source file (for reference in results)
 
         Returns:
-            Text content or None if empty
+            FailedTest objects in document order
         """
-        if element is None:
-            return None
-
-        text = element.text
-        if text and text.strip():
-            return text.strip()
+        target = _FailedTestTarget(source_path)
+        if lxml_etree is not None:
+            parser = lxml_etree.XMLParser(target=target, **_LXML_PARSE_OPTIONS)
+            parser.feed(data)
+            failed_tests: list[FailedTest] = parser.close()
+            return failed_tests
 
-        return None
+        # expat would call back into Python for every text node, so with the stdlib parser it is
+        # faster to let the C tree builder stream testcase elements and replay only failing ones
+        for _, elem in ElementTree.iterparse(io.BytesIO(data), events=("end",)):
+            if elem.tag != "testcase":
+                continue
+            if elem.find("failure") is not None or elem.find("error") is not None:
+                children = {}
+                for child in reversed(elem):
+                    if child.tag in _CAPTURED_CHILD_TAGS:
+                        children[child.tag] = (child.attrib, child.text)
+                target.add_testcase(elem.attrib, children)
+            elem.clear()
+        return target.close()
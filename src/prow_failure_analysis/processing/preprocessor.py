@@ -1,4 +1,7 @@
+import functools
+import itertools
 import logging
+import mmap
 import tempfile
 from pathlib import Path
 from typing import Any
@@ -7,10 +10,32 @@ from cordon import AnalysisConfig, SemanticLogAnalyzer
 from cordon.embedding import create_vectorizer
 
 from ..constants import CHARS_PER_TOKEN
-from ..utils import retry_with_backoff
+from ..utils import retry_with_backoff, translate_newlines
 
 logger = logging.getLogger(__name__)
 
+# Texts longer than this (whole logs, samples) are tokenized uncached so they aren't pinned in memory
+_MAX_CACHED_TEXT_CHARS = 2048
+
+# Once the per-instance token cache grows past this, the oldest half is evicted
+_MAX_TOKEN_CACHE_ENTRIES = 100_000
+
+
+def _read_mapped_text(path: Path) -> str:
+    """Read a large log as UTF-8 text by decoding straight from a memory map.
+
+    read_text() holds a full bytes copy alongside the decoded string; decoding
+    from the map leaves the raw bytes in reclaimable page cache instead.
+
+    Args:
+        path: Path to a non-empty log file
+
+    Returns:
+        Decoded log content with universal newlines applied
+    """
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return translate_newlines(str(mapped, "utf-8"))
+
 
 class LogPreprocessor:
     """Reduces log size using semantic anomaly detection while preserving critical information."""
@@ -49,6 +74,8 @@ class LogPreprocessor:
         self.safety_margin = safety_margin
         self.k_neighbors = k_neighbors
         self.min_percentile = min_percentile
+        # Token counts for short texts; log lines repeat heavily within and across steps
+        self._token_cache: dict[str, int] = {}
 
         # Resolve backend settings from config or arguments
         self.backend = backend or (config.cordon_backend if config else "sentence-transformers")
@@ -73,15 +100,22 @@ class LogPreprocessor:
             self.size_threshold = 50_000
             logger.info("No config provided, using default token limits")
 
-        cordon_config = self._build_cordon_config()
-        self.vectorizer = create_vectorizer(cordon_config)
+    @functools.cached_property
+    def vectorizer(self) -> Any:
+        """Embedding vectorizer, created on first use so logs that pass through never load the model."""
+        return create_vectorizer(self._build_cordon_config())
 
+    @functools.cached_property
+    def model_max_sequence_tokens(self) -> int:
+        """Max sequence length of the embedding model, resolved on first use."""
         if hasattr(self.vectorizer, "model") and hasattr(self.vectorizer.model, "max_seq_length"):
-            self.model_max_sequence_tokens = self.vectorizer.model.max_seq_length
-            logger.info(f"Embedding model max sequence length: {self.model_max_sequence_tokens} tokens")
-        else:
-            self.model_max_sequence_tokens = self._get_remote_model_max_tokens()
-            logger.info(f"Using remote model max sequence length: {self.model_max_sequence_tokens} tokens")
+            max_seq_length: int = self.vectorizer.model.max_seq_length
+            logger.info(f"Embedding model max sequence length: {max_seq_length} tokens")
+            return max_seq_length
+
+        max_seq_length = self._get_remote_model_max_tokens()
+        logger.info(f"Using remote model max sequence length: {max_seq_length} tokens")
+        return max_seq_length
 
     def _get_remote_model_max_tokens(self) -> int:
         """Get max sequence tokens for remote embedding models from LiteLLM database."""
@@ -151,13 +185,30 @@ class LogPreprocessor:
     def _estimate_tokens(self, text: str) -> int:
         """Estimate token count using model's tokenizer or fallback to char-based estimation."""
         if hasattr(self.vectorizer, "model") and hasattr(self.vectorizer.model, "tokenizer"):
+            tokenizer = self.vectorizer.model.tokenizer
+            cacheable = len(text) <= _MAX_CACHED_TEXT_CHARS
+            if cacheable:
+                cached = self._token_cache.get(text)
+                if cached is not None:
+                    return cached
             try:
-                tokens = self.vectorizer.model.tokenizer.encode(text, add_special_tokens=True)
-                return len(tokens)
+                count = len(tokenizer.encode(text, add_special_tokens=True))
             except Exception:
                 pass
+            else:
+                if cacheable:
+                    self._store_token_count(text, count)
+                return count
         return len(text) // CHARS_PER_TOKEN
 
+    def _store_token_count(self, text: str, count: int) -> None:
+        """Cache a token count, evicting the oldest half once the cache is full."""
+        if len(self._token_cache) >= _MAX_TOKEN_CACHE_ENTRIES:
+            # Dicts keep insertion order, so this is a cheap FIFO eviction
+            for key in list(itertools.islice(self._token_cache, _MAX_TOKEN_CACHE_ENTRIES // 2)):
+                del self._token_cache[key]
+        self._token_cache[text] = count
+
     @retry_with_backoff(max_retries=3, rate_limit_delay=6.0, context_errors_no_retry=False)
     def _run_cordon_analysis(self, content_to_process: str, window_size: int, target_percentile: float) -> str:
         """Run cordon analysis with retry handling.
@@ -203,16 +254,10 @@ class LogPreprocessor:
 
         log_size = log_path_obj.stat().st_size
 
-        if log_size < self.size_threshold:
-            logger.debug(f"Step {step_name}: {log_size} bytes, skipping preprocessing")
-            return log_path_obj.read_text()
-
-        quick_tokens = log_size // CHARS_PER_TOKEN
-        if quick_tokens <= max_tokens * 0.8:
-            logger.debug(f"Step {step_name}: ~{quick_tokens} tokens, under limit")
+        if self._fits_without_reduction(log_size, max_tokens, step_name):
             return log_path_obj.read_text()
 
-        log_content = log_path_obj.read_text()
+        log_content = _read_mapped_text(log_path_obj)
 
         if len(log_content) > 1_000_000:
             sample = log_content[:10_000]
@@ -226,12 +271,12 @@ class LogPreprocessor:
         logger.info(f"Step {step_name}: {estimated_tokens} tokens (limit: {max_tokens}), keeping top {pct:.1f}%")
 
         try:
-            lines = [line.rstrip("\n") for line in log_content.split("\n")]
+            # Split the tail off in place rather than re-joining every preceding line
+            parts = log_content.rsplit("\n", self.last_lines_to_keep) if self.last_lines_to_keep else [log_content]
+            last_lines = parts[1:] if len(parts) > self.last_lines_to_keep else []
+            content_to_process = parts[0] if last_lines else log_content
 
-            last_lines = lines[-self.last_lines_to_keep :] if len(lines) > self.last_lines_to_keep else []
-            content_to_process = "\n".join(lines[: -self.last_lines_to_keep]) if last_lines else "\n".join(lines)
-
-            max_line_tokens = self._calculate_max_line_tokens(lines)
+            max_line_tokens = self._calculate_max_line_tokens(log_content.split("\n"))
             window_size = max(1, int((self.model_max_sequence_tokens * self.safety_margin) / max(1, max_line_tokens)))
 
             logger.info(f"Step {step_name}: max_line_tokens={max_line_tokens}, window_size={window_size}")
@@ -253,6 +298,32 @@ class LogPreprocessor:
             logger.error(f"Step {step_name}: preprocessing failed: {e}, returning original")
             return log_path_obj.read_text()
 
+    def _fits_without_reduction(self, log_size: int, max_tokens: int, step_name: str) -> bool:
+        """Check whether a log is small enough to be returned unchanged.
+
+        Args:
+            log_size: Log size in bytes
+            max_tokens: Target token count
+            step_name: Step name for logging
+
+        Returns:
+            True if the log is below the size threshold or comfortably under the token limit
+        """
+        if log_size < self.size_threshold:
+            logger.debug(f"Step {step_name}: {log_size} bytes, skipping preprocessing")
+            return True
+
+        quick_tokens = log_size // CHARS_PER_TOKEN
+        if quick_tokens <= max_tokens * 0.8:
+            logger.debug(f"Step {step_name}: ~{quick_tokens} tokens, under limit")
+            return True
+
+        return False
+
+    def _passthrough_size_limit(self, max_tokens: int) -> int:
+        """Smallest log size in bytes that _fits_without_reduction rejects."""
+        return max(self.size_threshold, (int(max_tokens * 0.8) + 1) * CHARS_PER_TOKEN)
+
     def _calculate_max_line_tokens(self, lines: list[str]) -> int:
         """Calculate max token count from sampled lines."""
         non_empty = [line for line in lines if line.strip()]
@@ -263,7 +334,30 @@ class LogPreprocessor:
         step = max(1, len(non_empty) // sample_size)
         sampled = non_empty[::step][:sample_size]
 
-        return max((self._estimate_tokens(line) for line in sampled), default=50)
+        return max(self._estimate_tokens_batch(sampled), default=50)
+
+    def _estimate_tokens_batch(self, texts: list[str]) -> list[int]:
+        """Estimate token counts for several texts with a single batched tokenizer call.
+
+        Fast tokenizers loop over the batch natively, which avoids one Python-level
+        encode call per text. Lines already counted are served from the token cache,
+        so only unseen texts reach the tokenizer. Falls back to char-based estimation
+        like _estimate_tokens.
+        """
+        if hasattr(self.vectorizer, "model") and hasattr(self.vectorizer.model, "tokenizer"):
+            counts = {text: self._token_cache[text] for text in texts if text in self._token_cache}
+            misses = list(dict.fromkeys(text for text in texts if text not in counts))
+            try:
+                if misses:
+                    encoded = self.vectorizer.model.tokenizer(misses, add_special_tokens=True)
+                    for text, ids in zip(misses, encoded["input_ids"], strict=True):
+                        counts[text] = len(ids)
+                        if len(text) <= _MAX_CACHED_TEXT_CHARS:
+                            self._store_token_count(text, len(ids))
+                return [counts[text] for text in texts]
+            except Exception:
+                pass
+        return [len(text) // CHARS_PER_TOKEN for text in texts]
 
     def preprocess(self, log_content: str, step_name: str = "unknown", max_tokens: int | None = None) -> str:
         """Preprocess log content from memory.
@@ -276,6 +370,19 @@ class LogPreprocessor:
         Returns:
             Preprocessed log content
         """
+        max_tokens = max_tokens or self.max_tokens
+
+        # UTF-8 needs at least one byte per character, so the character count already
+        # settles ASCII logs and logs too large to pass through; only encode the rest
+        log_size = len(log_content)
+        if not log_content.isascii() and log_size < self._passthrough_size_limit(max_tokens):
+            log_size = len(log_content.encode("utf-8"))
+
+        # Content that would pass through unchanged never needs the temp file round-trip
+        if self._fits_without_reduction(log_size, max_tokens, step_name):
+            # Match the universal-newline translation the file read used to apply
+            return translate_newlines(log_content)
+
         with tempfile.NamedTemporaryFile(mode="w", suffix=".log", delete=False) as tmp_file:
             tmp_path = tmp_file.name
             tmp_file.write(log_content)
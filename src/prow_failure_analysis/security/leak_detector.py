@@ -1,16 +1,50 @@
+import functools
+import itertools
 import logging
+from collections.abc import Iterable, Iterator
+from typing import Any
 
 from detect_secrets.core.plugins.util import get_mapping_from_secret_type_to_class
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on distinct lines whose scan results are remembered per detector
+_MAX_LINE_CACHE_ENTRIES = 50_000
+# Lines longer than this are scanned every time rather than cached
+_MAX_CACHED_LINE_CHARS = 4096
+
+
+@functools.lru_cache(maxsize=1)
+def _load_plugins() -> dict[str, Any]:
+    """Instantiate every detect-secrets plugin once, keyed by secret type.
+
+    Plugins are stateless line analyzers, so one instance of each is shared by
+    every LeakDetector rather than being rebuilt for each line scanned.
+    """
+    # The library annotates this with an unbound TypeVar, which mypy resolves to Never
+    plugin_classes: dict[str, type[Any]] = get_mapping_from_secret_type_to_class()
+    plugins: dict[str, Any] = {}
+    for secret_type, plugin_class in plugin_classes.items():
+        try:
+            plugins[secret_type] = plugin_class()
+        except Exception as e:
+            logger.debug(f"Plugin {secret_type} failed to initialize: {e}")
+    return plugins
+
+
+@functools.lru_cache(maxsize=64)
+def _redaction_label(secret_type: str) -> str:
+    """Build the redaction label for a secret type once and share it across redactions."""
+    return f"[REDACTED: {secret_type}]"
+
 
 class LeakDetector:
     """Detects and redacts secrets from text to prevent leaks in logs/comments."""
 
     def __init__(self) -> None:
         """Initialize the leak detector with default plugins."""
-        self.plugins = get_mapping_from_secret_type_to_class()
+        self.plugins = _load_plugins()
+        self._line_cache: dict[str, tuple[tuple[int, int, str], ...]] = {}
         logger.debug(f"Initialized leak detector with {len(self.plugins)} plugins")
 
     def sanitize_text(self, text: str) -> str:
@@ -25,54 +59,124 @@ class LeakDetector:
         if not text:
             return text
 
-        secrets = self._detect_secrets(text)
-        if not secrets:
-            return text
-
-        # replace secrets in reverse order to maintain string positions
-        secrets.sort(key=lambda x: x[0], reverse=True)
-        sanitized = text
-        for start, end, secret_type in secrets:
-            redaction_label = self._get_redaction_label(secret_type)
-            sanitized = sanitized[:start] + redaction_label + sanitized[end:]
+        return "".join(self.sanitize_stream([text]))
 
-        logger.info(f"Redacted {len(secrets)} secret(s) from text")
-        return sanitized
+    def sanitize_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        """Sanitize text that arrives in chunks, yielding it back one line at a time.
 
-    def _detect_secrets(self, text: str) -> list[tuple[int, int, str]]:
-        """Detect all secrets in the text and return their positions.
+        Plugins only ever match within a single line, so holding back the unfinished
+        last line of each chunk is enough to catch secrets split across chunk
+        boundaries. Memory stays proportional to the longest line rather than the
+        whole text.
 
         Args:
-            text: The text to scan
+            chunks: Pieces of text in order, split at arbitrary positions
 
-        Returns:
-            List of tuples (start_pos, end_pos, secret_type) for each secret found
+        Yields:
+            Sanitized lines, each with its trailing newline except possibly the last
         """
-        secrets = []
-        lines = text.split("\n")
-        current_pos = 0
-
-        for line_num, line in enumerate(lines, start=1):
-            line_with_newline = line + ("\n" if line_num < len(lines) else "")
-
-            for plugin_name, plugin_class in self.plugins.items():
-                try:
-                    plugin = plugin_class()
-                    findings = plugin.analyze_line(filename="", line=line, line_number=line_num, **{})
+        partial: list[str] = []
+        line_num = 0
+        redacted = 0
+
+        for chunk in chunks:
+            *complete, rest = chunk.split("\n")
+            if complete:
+                complete[0] = "".join(partial) + complete[0]
+                partial.clear()
+                for line in complete:
+                    line_num += 1
+                    sanitized, count = self._redact_line(line, line_num)
+                    redacted += count
+                    yield sanitized + "\n"
+            if rest:
+                partial.append(rest)
+
+        if partial:
+            sanitized, count = self._redact_line("".join(partial), line_num + 1)
+            redacted += count
+            yield sanitized
+
+        if redacted:
+            logger.info(f"Redacted {redacted} secret(s) from text")
+
+    def _redact_line(self, line: str, line_num: int) -> tuple[str, int]:
+        """Replace every secret found in one line with its redaction label.
+
+        Plugins often report the same or overlapping spans (e.g. an AWS key that is
+        also a quoted high-entropy string), so spans are merged first and each
+        merged region is replaced exactly once.
 
-                    for secret in findings:
-                        secret_matches = self._find_secret_positions(line, secret)
-                        for match_start, match_end in secret_matches:
-                            abs_start = current_pos + match_start
-                            abs_end = current_pos + match_end
-                            secrets.append((abs_start, abs_end, secret.type))
+        Args:
+            line: The line to sanitize, without its trailing newline
+            line_num: 1-based line number, used for diagnostics only
 
-                except Exception as e:
-                    logger.debug(f"Plugin {plugin_name} failed on line {line_num}: {e}")
+        Returns:
+            Tuple of (sanitized line, number of regions redacted)
+        """
+        secrets = self._scan_line(line, line_num)
+        if not secrets:
+            return line, 0
+
+        # sweep spans in start order, folding overlaps into the widest span at that start
+        regions: list[tuple[int, int, str]] = []
+        for start, end, secret_type in sorted(secrets, key=lambda x: (x[0], -x[1])):
+            if regions and start < regions[-1][1]:
+                prev_start, prev_end, prev_type = regions[-1]
+                regions[-1] = (prev_start, max(prev_end, end), prev_type)
+            else:
+                regions.append((start, end, secret_type))
+
+        parts = []
+        pos = 0
+        for start, end, secret_type in regions:
+            parts.append(line[pos:start])
+            parts.append(self._get_redaction_label(secret_type))
+            pos = end
+        parts.append(line[pos:])
+
+        return "".join(parts), len(regions)
+
+    def _scan_line(self, line: str, line_num: int) -> tuple[tuple[int, int, str], ...]:
+        """Run every plugin over one line, reusing the result for repeated lines.
+
+        Plugin findings depend only on the line's content, so logs full of repeated
+        clean lines (progress output, retries, blank lines) are scanned once per
+        distinct line instead of once per occurrence.
 
-            current_pos += len(line_with_newline)
+        Args:
+            line: The line to scan, without its trailing newline
+            line_num: 1-based line number, used for diagnostics only
 
-        return secrets
+        Returns:
+            Tuples of (start_pos, end_pos, secret_type) relative to the line
+        """
+        cacheable = len(line) <= _MAX_CACHED_LINE_CHARS
+        if cacheable:
+            cached = self._line_cache.get(line)
+            if cached is not None:
+                return cached
+
+        found: list[tuple[int, int, str]] = []
+        for plugin_name, plugin in self.plugins.items():
+            try:
+                findings = plugin.analyze_line(filename="", line=line, line_number=line_num, **{})
+
+                for secret in findings:
+                    for match_start, match_end in self._find_secret_positions(line, secret):
+                        found.append((match_start, match_end, secret.type))
+
+            except Exception as e:
+                logger.debug(f"Plugin {plugin_name} failed on line {line_num}: {e}")
+
+        result = tuple(found)
+        if cacheable:
+            if len(self._line_cache) >= _MAX_LINE_CACHE_ENTRIES:
+                # Dicts keep insertion order, so this is a cheap FIFO eviction
+                for key in list(itertools.islice(self._line_cache, _MAX_LINE_CACHE_ENTRIES // 2)):
+                    del self._line_cache[key]
+            self._line_cache[line] = result
+        return result
 
     def _find_secret_positions(self, line: str, secret: object) -> list[tuple[int, int]]:
         """Find the start and end positions of a secret in a line.
@@ -112,4 +216,4 @@ class LeakDetector:
         Returns:
             Formatted redaction label
         """
-        return f"[REDACTED: {secret_type}]"
+        return _redaction_label(secret_type)
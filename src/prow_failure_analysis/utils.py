@@ -1,6 +1,8 @@
 """Utility functions and decorators for the failure analysis tool."""
 
 import logging
+import re
+import threading
 import time
 from collections.abc import Callable
 from functools import wraps
@@ -11,12 +13,36 @@ logger = logging.getLogger(__name__)
 # Type variable for generic function return type
 T = TypeVar("T")
 
+# Error messages that indicate a rate limit or exhausted quota
+_RATE_LIMIT_RE = re.compile(r"rate limit|quota|429|resource_exhausted", re.IGNORECASE)
+# Error messages that indicate the request exceeded the model's context window
+_CONTEXT_ERROR_RE = re.compile(r"context.*window|window.*context|exceeds the maximum", re.IGNORECASE | re.DOTALL)
+
+
+def translate_newlines(text: str) -> str:
+    """Apply the universal-newline translation that text-mode file reads perform.
+
+    Args:
+        text: Text that may contain CRLF or bare CR line endings
+
+    Returns:
+        The text with every line ending normalized to a single newline
+    """
+    if "\r" not in text:
+        return text
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+class RetryCancelledError(Exception):
+    """Raised when a retry wait is interrupted by its cancel event."""
+
 
 def retry_with_backoff(
     max_retries: int = 3,
     base_delay: float = 2.0,
     rate_limit_delay: float = 6.0,
     context_errors_no_retry: bool = True,
+    cancel_event: threading.Event | None = None,
 ) -> Callable[[Callable[..., T]], Callable[..., T]]:
     """Decorator to retry a function with exponential backoff on rate limit or transient errors.
 
@@ -25,6 +51,8 @@ def retry_with_backoff(
         base_delay: Base delay in seconds for non-rate-limit errors (default: 2.0)
         rate_limit_delay: Base delay in seconds for rate limit errors (default: 6.0)
         context_errors_no_retry: If True, don't retry context window errors (default: True)
+        cancel_event: Optional event that, once set, aborts any pending backoff wait with
+            RetryCancelledError instead of sleeping it out (default: None)
 
     Returns:
         Decorated function with retry logic
@@ -34,6 +62,9 @@ def retry_with_backoff(
         def call_api(data):
             return api.generate(data)
     """
+    # Backoff schedules are fixed per decoration, so compute them once
+    transient_delays = tuple(base_delay * (1 << attempt) for attempt in range(max_retries))
+    rate_limit_delays = tuple(rate_limit_delay * (1 << attempt) for attempt in range(max_retries))
 
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @wraps(func)
@@ -50,17 +81,9 @@ def retry_with_backoff(
                     error_msg = str(e)
 
                     # Check error types
-                    is_rate_limit = (
-                        "rate limit" in error_msg.lower()
-                        or "quota" in error_msg.lower()
-                        or "429" in error_msg
-                        or "resource_exhausted" in error_msg.lower()
-                    )
+                    is_rate_limit = _RATE_LIMIT_RE.search(error_msg) is not None
 
-                    is_context_error = context_errors_no_retry and (
-                        ("context" in error_msg.lower() and "window" in error_msg.lower())
-                        or "exceeds the maximum" in error_msg.lower()
-                    )
+                    is_context_error = context_errors_no_retry and _CONTEXT_ERROR_RE.search(error_msg) is not None
 
                     # Don't retry context errors - they won't succeed
                     if is_context_error:
@@ -72,19 +95,22 @@ def retry_with_backoff(
                         logger.error(f"{func_name}: Failed after {max_retries} attempts. Error: {e}")
                         raise
 
-                    # Calculate delay with exponential backoff
+                    # Look up the exponential backoff delay for this attempt
                     if is_rate_limit:
-                        delay = rate_limit_delay * (2**attempt)
+                        delay = rate_limit_delays[attempt]
                         error_type = "rate limit"
                     else:
-                        delay = base_delay * (2**attempt)
+                        delay = transient_delays[attempt]
                         error_type = "transient"
 
                     logger.warning(
                         f"{func_name}: {error_type} error (attempt {attempt + 1}/{max_retries}), "
                         f"retrying in {delay:.1f}s... Error: {e}"
                     )
-                    time.sleep(delay)
+                    if cancel_event is None:
+                        time.sleep(delay)
+                    elif cancel_event.wait(delay):
+                        raise RetryCancelledError(f"{func_name}: retry cancelled during backoff") from e
 
             # Should never reach here due to raise in loop, but satisfy type checker
             if last_error:
@@ -0,0 +1,46 @@
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+from prow_failure_analysis.analysis.analyzer import FailureAnalyzer, RCAReport
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _patch_dspy(module_mocker):
+    """Stub dspy in the analyzer module once per test module."""
+    module_mocker.patch("prow_failure_analysis.analysis.analyzer.dspy")
+
+
+@pytest.fixture
+def analyzer() -> FailureAnalyzer:
+    """Create a FailureAnalyzer with dspy stubbed out."""
+    return FailureAnalyzer()
+
+
+@pytest.fixture
+def report_factory() -> Callable[..., RCAReport]:
+    """Return a factory building an RCAReport with test defaults and field overrides."""
+
+    def _make(**overrides: Any) -> RCAReport:
+        fields: dict[str, Any] = {
+            "job_name": "test-job",
+            "build_id": "12345",
+            "pr_number": None,
+            "summary": "Test failed",
+            "detailed_analysis": "Details here",
+            "category": "test",
+            "step_analyses": [],
+        }
+        fields.update(overrides)
+        return RCAReport(**fields)
+
+    return _make
+
+
+@pytest.fixture(scope="session")
+def log_file(tmp_path_factory: pytest.TempPathFactory) -> str:
+    """Write a static step log once per session and return its path."""
+    path = tmp_path_factory.mktemp("logs") / "step.log"
+    path.write_text("test log content")
+    return str(path)
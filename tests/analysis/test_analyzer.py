@@ -1,19 +1,21 @@
 import json
-import tempfile
-from pathlib import Path
 
 import pytest
 
 from prow_failure_analysis.analysis.analyzer import (
     ArtifactAnalysis,
-    FailureAnalyzer,
-    RCAReport,
     StepAnalysis,
     _sanitize_json_string,
 )
 from prow_failure_analysis.gcs.models import JobResult, StepResult
 
 
+def assert_all_in(text: str, needles: list[str]) -> None:
+    """Assert every needle occurs in text, reporting all missing ones at once."""
+    missing = [needle for needle in needles if needle not in text]
+    assert not missing, f"missing from output: {missing}"
+
+
 class TestSanitizeJsonString:
     """Tests for _sanitize_json_string helper function."""
 
@@ -23,6 +25,11 @@ class TestSanitizeJsonString:
         result = _sanitize_json_string(json_str)
         assert json.loads(result) == {"key": "value", "number": 42}
 
+    def test_sanitize_clean_json_returned_as_is(self):
+        """Test that JSON without control characters is returned without rewriting."""
+        json_str = '[{"source": "build.log", "content": "error: caf\u00e9 \\"quoted\\""}]'
+        assert _sanitize_json_string(json_str) is json_str
+
     def test_sanitize_embedded_newlines(self):
         """Test that literal newlines in strings are escaped."""
         json_str = '{"message": "line1\nline2\nline3"}'
@@ -85,12 +92,10 @@ class TestSanitizeJsonString:
 class TestArtifactBatchGenji:
     """Tests for Genji-based artifact batch analysis."""
 
-    def test_single_artifact_produces_valid_json(self, mocker):
+    def test_single_artifact_produces_valid_json(self, analyzer):
         """Test that a single artifact batch produces valid ArtifactAnalysis output."""
         from genji import MockBackend
 
-        mocker.patch("prow_failure_analysis.analysis.analyzer.dspy")
-        analyzer = FailureAnalyzer()
         analyzer._genji_backend = MockBackend(default_response="No significant findings.")
 
         result = analyzer._analyze_artifact_batch({"test.log": "some log content"}, batch_num=1)
@@ -99,12 +104,10 @@ class TestArtifactBatchGenji:
         assert result[0].artifact_path == "test.log"
         assert result[0].key_findings == "No significant findings."
 
-    def test_multiple_artifacts_valid_json(self, mocker):
+    def test_multiple_artifacts_valid_json(self, analyzer):
         """Test that multiple artifacts in a batch all produce valid output."""
         from genji import MockBackend
 
-        mocker.patch("prow_failure_analysis.analysis.analyzer.dspy")
-        analyzer = FailureAnalyzer()
         analyzer._genji_backend = MockBackend(default_response="Found error.")
 
         batch = {"a.yaml": "content a", "b.log": "content b", "c.json": "content c"}
@@ -118,22 +121,16 @@ class TestArtifactBatchGenji:
         for r in result:
             assert r.key_findings == "Found error."
 
-    def test_empty_batch_returns_empty(self, mocker):
+    def test_empty_batch_returns_empty(self, analyzer):
         """Test that an empty batch returns an empty list without calling the backend."""
-        mocker.patch("prow_failure_analysis.analysis.analyzer.dspy")
-        analyzer = FailureAnalyzer()
-
         result = analyzer._analyze_artifact_batch({}, batch_num=1)
 
         assert result == []
 
-    def test_backend_error_returns_failure_entries(self, mocker):
+    def test_backend_error_returns_failure_entries(self, analyzer):
         """Test that a backend error returns ArtifactAnalysis entries with error messages."""
         from genji import MockBackend
 
-        mocker.patch("prow_failure_analysis.analysis.analyzer.dspy")
-        analyzer = FailureAnalyzer()
-
         # Use a response_fn that raises to simulate backend failure
         def raise_error(prompt: str) -> str:
             raise RuntimeError("API down")
@@ -147,66 +144,88 @@ class TestArtifactBatchGenji:
         assert "Analysis failed" in result[0].key_findings
 
 
-class TestRCAReport:
-    """Tests for RCAReport markdown generation."""
+class TestParseArtifactFindings:
+    """Tests for parsing rendered artifact findings."""
 
-    def test_to_markdown_basic(self):
-        """Test markdown generation with basic info."""
-        report = RCAReport(
-            job_name="test-job",
-            build_id="12345",
-            pr_number=None,
-            summary="Test failed",
-            detailed_analysis="Details here",
-            category="test",
-            step_analyses=[],
+    def test_parse_valid_findings(self, analyzer):
+        """Test that valid findings are parsed into ArtifactAnalysis objects."""
+        rendered = json.dumps(
+            [
+                {"artifact_path": "a.yaml", "key_findings": "Finding A."},
+                {"artifact_path": "b.log", "key_findings": "Finding B."},
+            ]
         )
 
-        md = report.to_markdown()
+        result = analyzer._parse_artifact_findings(rendered)
 
-        assert "# Pipeline Failure Analysis" in md
-        assert "**Job:** `test-job`" in md
-        assert "**Build:** `12345`" in md
-        assert "**Category:** Test" in md
-        assert "## Root Cause" in md
-        assert "Test failed" in md
-        assert "## Technical Details" in md
-        assert "Details here" in md
-
-    def test_to_markdown_with_pr(self):
-        """Test markdown generation includes PR number."""
-        report = RCAReport(
-            job_name="test-job",
-            build_id="12345",
-            pr_number="999",
-            summary="Test failed",
-            detailed_analysis="Details here",
-            category="build",
-            step_analyses=[],
-        )
+        assert result == [
+            ArtifactAnalysis(artifact_path="a.yaml", key_findings="Finding A."),
+            ArtifactAnalysis(artifact_path="b.log", key_findings="Finding B."),
+        ]
 
-        md = report.to_markdown()
+    def test_parse_empty_array(self, analyzer):
+        """Test that an empty array yields no findings."""
+        assert analyzer._parse_artifact_findings("[]") == []
 
-        assert "**PR:** #999" in md
-        assert "**Category:** Build" in md
+    def test_parse_missing_artifact_path_raises(self, analyzer):
+        """Test that a finding without artifact_path raises KeyError."""
+        with pytest.raises(KeyError, match="artifact_path"):
+            analyzer._parse_artifact_findings('[{"key_findings": "Finding."}]')
 
-    def test_to_markdown_category_display(self):
-        """Test markdown generation displays category."""
-        report = RCAReport(
-            job_name="test-job",
-            build_id="12345",
-            pr_number=None,
-            summary="Test failed",
-            detailed_analysis="Details here",
-            category="infrastructure",
-            step_analyses=[],
-        )
+    def test_parse_missing_key_findings_raises(self, analyzer):
+        """Test that a finding without key_findings raises KeyError."""
+        with pytest.raises(KeyError, match="key_findings"):
+            analyzer._parse_artifact_findings('[{"artifact_path": "a.yaml"}]')
 
-        md = report.to_markdown()
+    def test_parse_invalid_json_raises(self, analyzer):
+        """Test that malformed JSON raises ValueError."""
+        with pytest.raises(ValueError):
+            analyzer._parse_artifact_findings('[{"artifact_path": "a.yaml",')
+
+    def test_parse_non_object_item_raises(self, analyzer):
+        """Test that a non-object entry in the array raises ValueError."""
+        with pytest.raises(ValueError):
+            analyzer._parse_artifact_findings('["a.yaml"]')
 
-        assert "**Category:** Infrastructure" in md
+    def test_parse_non_array_raises(self, analyzer):
+        """Test that a JSON object instead of an array raises ValueError."""
+        with pytest.raises(ValueError):
+            analyzer._parse_artifact_findings('{"artifact_path": "a.yaml", "key_findings": "Finding."}')
 
-    def test_to_markdown_with_step_evidence(self):
+
+class TestRCAReport:
+    """Tests for RCAReport markdown generation."""
+
+    @pytest.mark.parametrize(
+        ("overrides", "expected"),
+        [
+            pytest.param(
+                {},
+                [
+                    "# Pipeline Failure Analysis",
+                    "**Job:** `test-job`",
+                    "**Build:** `12345`",
+                    "**Category:** Test",
+                    "## Root Cause",
+                    "Test failed",
+                    "## Technical Details",
+                    "Details here",
+                ],
+                id="basic",
+            ),
+            pytest.param(
+                {"pr_number": "999", "category": "build"}, ["**PR:** #999", "**Category:** Build"], id="with-pr"
+            ),
+            pytest.param({"category": "infrastructure"}, ["**Category:** Infrastructure"], id="category-display"),
+        ],
+    )
+    def test_to_markdown(self, report_factory, overrides, expected):
+        """Test markdown generation renders header fields and sections."""
+        md = report_factory(**overrides).to_markdown()
+
+        assert_all_in(md, expected)
+
+    def test_to_markdown_with_step_evidence(self, report_factory):
         """Test markdown generation includes step evidence."""
         step_analysis = StepAnalysis(
             step_name="test-stage/test-step",
@@ -218,36 +237,27 @@ class TestRCAReport:
             ],
         )
 
-        report = RCAReport(
-            job_name="test-job",
-            build_id="12345",
-            pr_number=None,
-            summary="Test failed",
-            detailed_analysis="Details here",
-            category="build",
-            step_analyses=[step_analysis],
-        )
+        report = report_factory(category="build", step_analyses=[step_analysis])
 
         md = report.to_markdown()
 
-        assert "## Evidence" in md
-        assert "**test-stage/test-step** — *build*" in md
         # Evidence now uses expandable details with source in summary
-        assert "<details>" in md
-        assert "<code>build.log</code>" in md
-        assert "Error 1" in md
-        assert "<code>compile.log</code>" in md
-        assert "Error 2" in md
+        assert_all_in(
+            md,
+            [
+                "## Evidence",
+                "**test-stage/test-step** — *build*",
+                "<details>",
+                "<code>build.log</code>",
+                "Error 1",
+                "<code>compile.log</code>",
+                "Error 2",
+            ],
+        )
 
-    def test_to_markdown_with_contributing_factors(self):
+    def test_to_markdown_with_contributing_factors(self, report_factory):
         """Test markdown generation includes LLM-ranked contributing factors."""
-        report = RCAReport(
-            job_name="test-job",
-            build_id="12345",
-            pr_number=None,
-            summary="Test failed",
-            detailed_analysis="Details here",
-            category="test",
+        report = report_factory(
             step_analyses=[
                 StepAnalysis(
                     step_name="test-step",
@@ -280,16 +290,9 @@ class TestRCAReport:
         assert "unselected.yaml" not in md
         assert "empty.yaml" not in md
 
-    def test_to_markdown_contributing_factors_no_step_analyses(self):
+    def test_to_markdown_contributing_factors_no_step_analyses(self, report_factory):
         """Test contributing factors still renders when there are no step analyses."""
-        report = RCAReport(
-            job_name="test-job",
-            build_id="12345",
-            pr_number=None,
-            summary="Test failed",
-            detailed_analysis="Details here",
-            category="test",
-            step_analyses=[],
+        report = report_factory(
             artifact_analyses=[
                 ArtifactAnalysis(artifact_path="pods/api.log", key_findings="Connection refused errors."),
             ],
@@ -303,16 +306,9 @@ class TestRCAReport:
         assert "<code>pods/api.log</code>" in md
         assert "Connection refused errors." in md
 
-    def test_to_markdown_no_contributing_factors_when_empty_paths(self):
+    def test_to_markdown_no_contributing_factors_when_empty_paths(self, report_factory):
         """Test contributing factors section is omitted when LLM returns no paths."""
-        report = RCAReport(
-            job_name="test-job",
-            build_id="12345",
-            pr_number=None,
-            summary="Test failed",
-            detailed_analysis="Details here",
-            category="test",
-            step_analyses=[],
+        report = report_factory(
             artifact_analyses=[
                 ArtifactAnalysis(artifact_path="a.yaml", key_findings="Some finding."),
             ],
@@ -323,16 +319,9 @@ class TestRCAReport:
 
         assert "### Contributing Factors" not in md
 
-    def test_to_markdown_contributing_factors_filters_noise(self):
+    def test_to_markdown_contributing_factors_filters_noise(self, report_factory):
         """Test that LLM-selected paths with noise findings are still filtered out."""
-        report = RCAReport(
-            job_name="test-job",
-            build_id="12345",
-            pr_number=None,
-            summary="Test failed",
-            detailed_analysis="Details here",
-            category="test",
-            step_analyses=[],
+        report = report_factory(
             artifact_analyses=[
                 ArtifactAnalysis(artifact_path="a.yaml", key_findings="No significant findings."),
                 ArtifactAnalysis(artifact_path="b.log", key_findings="Analysis failed: timeout"),
@@ -349,62 +338,60 @@ class TestRCAReport:
 class TestFailureAnalyzer:
     """Tests for FailureAnalyzer custom logic."""
 
-    def test_read_log_content_success(self, mocker):
+    def test_read_log_content_success(self, analyzer, log_file):
         """Test reading log content from temp file."""
-        mocker.patch("prow_failure_analysis.analysis.analyzer.dspy")
-        analyzer = FailureAnalyzer()
+        step = StepResult(name="test-step", passed=False, log_path=log_file, log_size=0)
 
-        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".log") as f:
-            f.write("test log content")
-            temp_path = f.name
+        content = analyzer._read_log_content(step)
 
-        try:
-            step = StepResult(name="test-step", passed=False, log_path=temp_path, log_size=0)
+        assert content == "test log content"
 
-            content = analyzer._read_log_content(step)
+    def test_read_log_content_empty_file(self, analyzer, tmp_path):
+        """Test reading an empty log file returns empty content."""
+        log = tmp_path / "step.log"
+        log.touch()
+        step = StepResult(name="test-step", passed=False, log_path=str(log), log_size=0)
 
-            assert content == "test log content"
-        finally:
-            Path(temp_path).unlink()
+        content = analyzer._read_log_content(step)
 
-    def test_read_log_content_no_path(self, mocker):
-        """Test reading log when no path is set."""
-        mocker.patch("prow_failure_analysis.analysis.analyzer.dspy")
-        analyzer = FailureAnalyzer()
+        assert content == ""
+
+    def test_read_log_content_translates_newlines(self, analyzer, tmp_path):
+        """Test reading a log normalizes CRLF and CR line endings like text-mode reads."""
+        log = tmp_path / "step.log"
+        log.write_bytes(b"first\r\nsecond\rthird\n")
+        step = StepResult(name="test-step", passed=False, log_path=str(log), log_size=0)
+
+        content = analyzer._read_log_content(step)
 
+        assert content == "first\nsecond\nthird\n"
+
+    def test_read_log_content_no_path(self, analyzer):
+        """Test reading log when no path is set."""
         step = StepResult(name="test-step", passed=False, log_path=None, log_size=0)
 
         content = analyzer._read_log_content(step)
 
         assert content == "(No log content available)"
 
-    def test_read_log_content_file_not_found(self, mocker):
+    def test_read_log_content_file_not_found(self, analyzer):
         """Test reading log handles missing file."""
-        mocker.patch("prow_failure_analysis.analysis.analyzer.dspy")
-        analyzer = FailureAnalyzer()
-
         step = StepResult(name="test-step", passed=False, log_path="/nonexistent.log", log_size=0)
 
         content = analyzer._read_log_content(step)
 
         assert content == "(No log content available)"
 
-    def test_get_step_context_no_graph(self, mocker):
+    def test_get_step_context_no_graph(self, analyzer):
         """Test step context when no graph available."""
-        mocker.patch("prow_failure_analysis.analysis.analyzer.dspy")
-        analyzer = FailureAnalyzer()
-
         step = StepResult(name="test-stage/test-step", passed=False, log_path=None, log_size=0)
 
         context = analyzer._get_step_context(step, {})
 
         assert context == "Step test-stage/test-step - no graph information available"
 
-    def test_get_step_context_with_dependencies(self, mocker):
+    def test_get_step_context_with_dependencies(self, analyzer):
         """Test step context extracts dependencies from graph."""
-        mocker.patch("prow_failure_analysis.analysis.analyzer.dspy")
-        analyzer = FailureAnalyzer()
-
         step = StepResult(name="test-stage/test-step", passed=False, log_path=None, log_size=0)
 
         step_graph = {"nodes": [{"name": "test-step", "dependencies": ["dep1", "dep2"]}]}
@@ -413,11 +400,8 @@ class TestFailureAnalyzer:
 
         assert "dependencies: ['dep1', 'dep2']" in context
 
-    def test_get_step_context_no_matching_node(self, mocker):
+    def test_get_step_context_no_matching_node(self, analyzer):
         """Test step context when step not found in graph."""
-        mocker.patch("prow_failure_analysis.analysis.analyzer.dspy")
-        analyzer = FailureAnalyzer()
-
         step = StepResult(name="test-stage/unknown-step", passed=False, log_path=None, log_size=0)
 
         step_graph = {"nodes": [{"name": "other-step", "dependencies": []}]}
@@ -426,20 +410,14 @@ class TestFailureAnalyzer:
 
         assert context == "Step test-stage/unknown-step - part of pipeline execution"
 
-    def test_build_artifacts_context_empty(self, mocker):
+    def test_build_artifacts_context_empty(self, analyzer):
         """Test building artifacts context with no artifacts."""
-        mocker.patch("prow_failure_analysis.analysis.analyzer.dspy")
-        analyzer = FailureAnalyzer()
-
         artifacts_dict = analyzer._build_artifacts_context(None)
 
         assert artifacts_dict == {}
 
-    def test_build_artifacts_context_with_files(self, mocker):
+    def test_build_artifacts_context_with_files(self, analyzer):
         """Test building artifacts context with artifact analyses."""
-        mocker.patch("prow_failure_analysis.analysis.analyzer.dspy")
-        analyzer = FailureAnalyzer()
-
         from prow_failure_analysis.analysis.analyzer import ArtifactAnalysis
 
         artifact_analyses = [
@@ -457,11 +435,35 @@ class TestFailureAnalyzer:
         assert artifacts_dict["analyses"][1]["artifact_path"] == "long-file.txt"
         assert artifacts_dict["analyses"][1]["key_findings"] == "Found critical error in logs"
 
-    def test_forward_raises_on_no_failures(self, mocker):
-        """Test forward raises ValueError when there are no failures."""
-        mocker.patch("prow_failure_analysis.analysis.analyzer.dspy")
-        analyzer = FailureAnalyzer()
+    def test_create_synthesis_context_serializes_json(self, analyzer):
+        """Test synthesis context is serialized to JSON that round-trips."""
+        step_analyses = [
+            StepAnalysis(
+                step_name="e2e/test",
+                failure_category="test",
+                root_cause="Timeout waiting for pod – café",
+                evidence=[{"source": "build.log", "content": "error\ndetails"}],
+            )
+        ]
+        artifact_analyses = [ArtifactAnalysis(artifact_path="events.json", key_findings="OOMKilled")]
+
+        steps_json, tests_json, artifacts_json = analyzer._create_synthesis_context(
+            step_analyses, [], artifact_analyses
+        )
 
+        assert json.loads(steps_json) == [
+            {
+                "step_name": "e2e/test",
+                "failure_category": "test",
+                "root_cause": "Timeout waiting for pod – café",
+                "evidence": [{"source": "build.log", "content": "error\ndetails"}],
+            }
+        ]
+        assert json.loads(tests_json) == []
+        assert json.loads(artifacts_json)["analyses"] == [{"artifact_path": "events.json", "key_findings": "OOMKilled"}]
+
+    def test_forward_raises_on_no_failures(self, analyzer):
+        """Test forward raises ValueError when there are no failures."""
         job_result = JobResult(
             job_name="test-job",
             build_id="12345",
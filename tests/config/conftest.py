@@ -0,0 +1,21 @@
+import pytest
+
+from prow_failure_analysis.config import Config
+
+
+@pytest.fixture
+def valid_config() -> Config:
+    """Create a Config with every required field set."""
+    return Config(
+        job_name="test-job",
+        build_id="12345",
+        llm_provider="openai",
+        llm_model="gpt-4",
+        llm_api_key="fake-key",
+    )
+
+
+@pytest.fixture(scope="session")
+def default_config() -> Config:
+    """Share one default Config across tests that only read it."""
+    return Config()
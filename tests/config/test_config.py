@@ -1,16 +1,14 @@
 """Unit tests for configuration module."""
 
-from prow_failure_analysis.config import Config
+from prow_failure_analysis.config import Config, _extract_org_repo_section
 
 
 class TestConfig:
     """Tests for Config custom logic."""
 
-    def test_validate_missing_required_fields(self):
+    def test_validate_missing_required_fields(self, default_config):
         """Test validate returns errors for missing required fields."""
-        config = Config()
-
-        errors = config.validate()
+        errors = default_config.validate()
 
         assert "JOB_NAME is required" in errors
         assert "BUILD_ID is required" in errors
@@ -18,38 +16,31 @@ class TestConfig:
         assert "LLM_MODEL is required" in errors
         assert "LLM_API_KEY is required" in errors
 
-    def test_validate_with_all_fields(self):
+    def test_validate_with_all_fields(self, valid_config):
         """Test validate returns no errors when all required fields set."""
-        config = Config()
-        config.job_name = "test-job"
-        config.build_id = "12345"
-        config.llm_provider = "openai"
-        config.llm_model = "gpt-4"
-        config.llm_api_key = "fake-key"
-
-        errors = config.validate()
+        errors = valid_config.validate()
 
         assert errors == []
 
     def test_validate_post_comment_requires_github_token(self):
         """Test validate requires github_token when post_pr_comment is enabled."""
-        config = Config()
-        config.job_name = "test-job"
-        config.build_id = "12345"
-        config.llm_provider = "openai"
-        config.llm_model = "gpt-4"
-        config.llm_api_key = "fake-key"
-        config.post_pr_comment = True
+        config = Config(
+            job_name="test-job",
+            build_id="12345",
+            llm_provider="openai",
+            llm_model="gpt-4",
+            llm_api_key="fake-key",
+            post_pr_comment=True,
+            github_token=None,
+        )
 
         errors = config.validate()
 
         assert "GITHUB_TOKEN is required when --post-comment is enabled" in errors
 
-    def test_should_ignore_step_no_patterns(self):
+    def test_should_ignore_step_no_patterns(self, default_config):
         """Test should_ignore_step returns False when no patterns configured."""
-        config = Config()
-
-        assert config.should_ignore_step("test-step") is False
+        assert default_config.should_ignore_step("test-step") is False
 
     def test_should_ignore_step_matches_pattern(self):
         """Test should_ignore_step returns True for matching patterns."""
@@ -60,11 +51,9 @@ class TestConfig:
         assert config.should_ignore_step("gather-must-gather") is True
         assert config.should_ignore_step("test-step") is False
 
-    def test_should_include_artifact_path_no_patterns(self):
+    def test_should_include_artifact_path_no_patterns(self, default_config):
         """Test should_include_artifact_path returns False when no patterns configured."""
-        config = Config()
-
-        assert config.should_include_artifact_path("test/file.txt") is False
+        assert default_config.should_include_artifact_path("test/file.txt") is False
 
     def test_should_include_artifact_path_matches_pattern(self):
         """Test should_include_artifact_path returns True for matching patterns."""
@@ -75,11 +64,9 @@ class TestConfig:
         assert config.should_include_artifact_path("config.yaml") is True
         assert config.should_include_artifact_path("test/random.txt") is False
 
-    def test_should_exclude_artifact_no_patterns(self):
+    def test_should_exclude_artifact_no_patterns(self, default_config):
         """Test should_exclude_artifact returns False when no patterns configured."""
-        config = Config()
-
-        assert config.should_exclude_artifact("stage/step/pods/cert-manager-abc/log.txt") is False
+        assert default_config.should_exclude_artifact("stage/step/pods/cert-manager-abc/log.txt") is False
 
     def test_should_exclude_artifact_simple_match(self):
         """Test should_exclude_artifact returns True for a matching exclusion pattern."""
@@ -125,26 +112,18 @@ class TestConfig:
         assert config.should_exclude_artifact("pods/openshift-console-abc/log.txt") is False
         assert config.should_exclude_artifact("pods/anything/log.txt") is False
 
-    def test_calculate_token_budgets_steps_weighted_higher(self):
+    def test_calculate_token_budgets_steps_weighted_higher(self, valid_config):
         """Test steps get 2x weight compared to tests."""
-        config = Config()
-        config.llm_model = "gpt-4"
-        config.llm_provider = "openai"
-
-        tokens_per_step, tokens_per_test, tokens_per_artifact_batch = config.calculate_token_budgets(1, 1, 0)
+        tokens_per_step, tokens_per_test, tokens_per_artifact_batch = valid_config.calculate_token_budgets(1, 1, 0)
 
         assert tokens_per_step > 0
         assert tokens_per_test > 0
         assert tokens_per_artifact_batch > 0
         assert tokens_per_step >= tokens_per_test
 
-    def test_calculate_token_budgets_enforces_limits(self):
+    def test_calculate_token_budgets_enforces_limits(self, valid_config):
         """Test token budgets enforce min/max limits."""
-        config = Config()
-        config.llm_model = "gpt-4"
-        config.llm_provider = "openai"
-
-        tokens_per_step, tokens_per_test, tokens_per_artifact_batch = config.calculate_token_budgets(1, 1, 0)
+        tokens_per_step, tokens_per_test, tokens_per_artifact_batch = valid_config.calculate_token_budgets(1, 1, 0)
 
         assert tokens_per_step >= 10_000
         assert tokens_per_test >= 10_000
@@ -185,6 +164,17 @@ class TestConfig:
         assert config._extract_org_repo_section("invalid-job-name") is None
         assert config._extract_org_repo_section("periodic-job") is None
 
+    def test_extract_org_repo_section_memoized_across_instances(self):
+        """Test org-repo extraction is cached on the job name, not per Config."""
+        job = "pull-ci-cached-org-cached-repo-main-test"
+        Config()._extract_org_repo_section(job)
+        hits_before = _extract_org_repo_section.cache_info().hits
+
+        section = Config()._extract_org_repo_section(job)
+
+        assert section == "cached-org-cached-repo"
+        assert _extract_org_repo_section.cache_info().hits == hits_before + 1
+
     def test_find_valid_org_repo_split_without_github_token(self):
         """Test finding org/repo split warns and uses first dash when no token."""
         config = Config()
@@ -202,10 +192,8 @@ class TestConfig:
 
         assert result == "my-org_my-repo"
 
-    def test_infer_org_repo_no_job_name(self):
+    def test_infer_org_repo_no_job_name(self, default_config):
         """Test infer_org_repo returns None when job_name not set."""
-        config = Config()
-
-        result = config.infer_org_repo()
+        result = default_config.infer_org_repo()
 
         assert result is None
@@ -0,0 +1,77 @@
+from collections.abc import Callable
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import Mock
+
+import pytest
+
+from prow_failure_analysis.gcs.client import GCSClient
+
+
+@pytest.fixture
+def client() -> GCSClient:
+    """Create a GCSClient around an injected stub storage client."""
+    return GCSClient(bucket_name="test-bucket", client=Mock())
+
+
+@pytest.fixture(scope="session")
+def blob_factory() -> Callable[[str], Mock]:
+    """Return a factory building lightweight blob stubs with only a name."""
+
+    def _make(name: str) -> Mock:
+        blob = Mock(spec=["name", "download_as_bytes"])
+        blob.name = name
+        return blob
+
+    return _make
+
+
+@pytest.fixture(scope="module")
+def xunit_blobs(blob_factory: Callable[[str], Mock]) -> list[Mock]:
+    """Blob listing for _list_xunit_files tests; blobs are read-only so the list is shared per module."""
+    return [
+        blob_factory("base/artifacts/stage/step/junit.xml"),
+        blob_factory("base/artifacts/stage/step/junit-results.xml"),
+        blob_factory("base/artifacts/stage/step/e2e-report.xml"),
+        blob_factory("base/artifacts/stage/step/results/test-results.xml"),
+        blob_factory("base/artifacts/stage/step/test-results/output.xml"),
+        blob_factory("base/artifacts/stage/step/random-file.txt"),  # Should be ignored
+        blob_factory("base/artifacts/stage/step/data.xml"),  # Should be ignored (no pattern match)
+        blob_factory("base/artifacts/stage/allowed-step/junit.xml"),
+        blob_factory("base/artifacts/stage/filtered-step/junit.xml"),  # Filtered when the step is ignored
+        blob_factory("base/artifacts/other-stage/step/junit.xml"),
+        blob_factory("base/artifacts/junit_operator.xml"),
+    ]
+
+
+class _ListingPage(list[Mock]):
+    """One page of a delimited listing: blobs plus the common prefixes."""
+
+    def __init__(self, blobs: list[Mock], prefixes: list[str]) -> None:
+        super().__init__(blobs)
+        self.prefixes = prefixes
+
+
+@pytest.fixture(scope="session")
+def fake_list_blobs() -> Callable[[list[Mock]], Callable[..., Any]]:
+    """Return a factory for list_blobs stand-ins that emulate GCS prefix and delimiter semantics."""
+
+    def _make(blobs: list[Mock]) -> Callable[..., Any]:
+        def list_blobs(bucket_name: str, prefix: str = "", delimiter: str | None = None, **kwargs: Any) -> Any:
+            matched = [blob for blob in blobs if blob.name.startswith(prefix)]
+            if delimiter is None:
+                return matched
+
+            items = []
+            prefixes: set[str] = set()
+            for blob in matched:
+                head, sep, _ = blob.name[len(prefix) :].partition(delimiter)
+                if sep:
+                    prefixes.add(f"{prefix}{head}{delimiter}")
+                else:
+                    items.append(blob)
+            return SimpleNamespace(pages=[_ListingPage(items, sorted(prefixes))])
+
+        return list_blobs
+
+    return _make
@@ -1,29 +1,69 @@
 import json
 from datetime import datetime
 
+import pytest
+
 from prow_failure_analysis.config import Config
 from prow_failure_analysis.gcs.client import GCSClient
 
+_FINISHED_JSON_FULL = json.dumps(
+    {
+        "timestamp": 1704110400,
+        "passed": True,
+        "result": "SUCCESS",
+        "revision": "abc123",
+        "metadata": {"job": "test-job"},
+    }
+)
+_FINISHED_JSON_EMPTY = "{}"
+_STEP_GRAPH_JSON = json.dumps({"nodes": ["step1", "step2"], "edges": []}).encode()
+
+
+class _StepFilterConfig:
+    """Config stub that ignores a single step."""
+
+    def should_ignore_step(self, step_name: str) -> bool:
+        return step_name == "stage/filtered-step"
+
+
+class _NamedBlob:
+    """Blob stub carrying only its name."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+
+class _FailingBlob:
+    """Blob stub whose download raises the given error."""
+
+    def __init__(self, error: Exception) -> None:
+        self.error = error
+
+    def download_as_bytes(self) -> bytes:
+        raise self.error
+
+
+def _raise_network_error(blob_path: str) -> None:
+    raise Exception("Network error")
+
 
 class TestGCSClient:
     """Tests for GCSClient parsing and filtering logic."""
 
-    def test_parse_finished_json_success(self, mocker) -> None:
-        """Test parsing a valid finished.json."""
-        mocker.patch("prow_failure_analysis.gcs.client.storage")
-        client = GCSClient(bucket_name="test-bucket")
-
-        finished_json = json.dumps(
-            {
-                "timestamp": 1704110400,
-                "passed": True,
-                "result": "SUCCESS",
-                "revision": "abc123",
-                "metadata": {"job": "test-job"},
-            }
-        )
+    def test_init_reuses_injected_client(self, mocker) -> None:
+        """Test an injected storage client is used as-is, without building a new one."""
+        storage = mocker.patch("prow_failure_analysis.gcs.client.storage")
+        storage_client = mocker.Mock()
 
-        result = client._parse_finished_json(finished_json)
+        client = GCSClient(bucket_name="test-bucket", client=storage_client)
+
+        assert client.client is storage_client
+        storage_client.bucket.assert_called_once_with("test-bucket")
+        storage.Client.create_anonymous_client.assert_not_called()
+
+    def test_parse_finished_json_success(self, client) -> None:
+        """Test parsing a valid finished.json."""
+        result = client._parse_finished_json(_FINISHED_JSON_FULL)
 
         assert result is not None
         assert result.passed is True
@@ -32,14 +72,9 @@ class TestGCSClient:
         assert result.metadata == {"job": "test-job"}
         assert isinstance(result.timestamp, datetime)
 
-    def test_parse_finished_json_minimal(self, mocker) -> None:
+    def test_parse_finished_json_minimal(self, client) -> None:
         """Test parsing finished.json with minimal fields."""
-        mocker.patch("prow_failure_analysis.gcs.client.storage")
-        client = GCSClient(bucket_name="test-bucket")
-
-        finished_json = json.dumps({})
-
-        result = client._parse_finished_json(finished_json)
+        result = client._parse_finished_json(_FINISHED_JSON_EMPTY)
 
         assert result is not None
         # Should use defaults
@@ -48,180 +83,238 @@ class TestGCSClient:
         assert result.revision is None
         assert result.metadata is None
 
-    def test_parse_finished_json_invalid(self, mocker) -> None:
+    def test_parse_finished_json_invalid(self, client) -> None:
         """Test parsing invalid JSON returns None."""
-        mocker.patch("prow_failure_analysis.gcs.client.storage")
-        client = GCSClient(bucket_name="test-bucket")
-
         result = client._parse_finished_json("not valid json {")
 
         assert result is None
 
-    def test_verify_blob_exists_exception(self, mocker) -> None:
-        """Test _verify_blob_exists handles exceptions gracefully."""
-        mocker.patch("prow_failure_analysis.gcs.client.storage")
-        client = GCSClient(bucket_name="test-bucket")
+    def test_parse_finished_json_oversized(self, client, mocker) -> None:
+        """Test oversized finished.json is rejected without parsing."""
+        loads = mocker.patch("prow_failure_analysis.gcs.client.orjson.loads")
+        oversized = b'{"passed": true, "padding": "' + b"x" * (1 << 20) + b'"}'
 
-        client.bucket.blob = mocker.Mock(side_effect=Exception("Network error"))
+        result = client._parse_finished_json(oversized)
+
+        assert result is None
+        loads.assert_not_called()
+
+    def test_verify_blob_exists_exception(self, client) -> None:
+        """Test _verify_blob_exists handles exceptions gracefully."""
+        client.bucket.blob = _raise_network_error
 
         result = client._verify_blob_exists("test-path")
 
         assert result is False
 
-    def test_fetch_blob_text_not_found(self, mocker) -> None:
-        """Test _fetch_blob_text returns None for 404."""
-        mocker.patch("prow_failure_analysis.gcs.client.storage")
-        client = GCSClient(bucket_name="test-bucket")
-
-        mock_blob = mocker.Mock()
-        mock_blob.download_as_text.side_effect = Exception("404 Not Found")
-        client.bucket.blob = mocker.Mock(return_value=mock_blob)
+    @pytest.mark.parametrize("error", ["404 Not Found", "Network error"], ids=["not-found", "other-error"])
+    def test_fetch_blob_text_error(self, client, error) -> None:
+        """Test _fetch_blob_text returns None for 404s and other errors."""
+        client.bucket.blob = lambda blob_path: _FailingBlob(Exception(error))
 
         result = client._fetch_blob_text("test-path")
 
         assert result is None
 
-    def test_fetch_blob_text_other_error(self, mocker) -> None:
-        """Test _fetch_blob_text returns None for other errors."""
-        mocker.patch("prow_failure_analysis.gcs.client.storage")
-        client = GCSClient(bucket_name="test-bucket")
-
-        mock_blob = mocker.Mock()
-        mock_blob.download_as_text.side_effect = Exception("Network error")
-        client.bucket.blob = mocker.Mock(return_value=mock_blob)
+    def test_fetch_blob_text_decodes_bytes(self, client, mocker) -> None:
+        """Test _fetch_blob_text decodes downloaded bytes, replacing invalid UTF-8."""
+        client._fetch_blob_bytes = mocker.Mock(return_value=b"log line \xff ok")
 
         result = client._fetch_blob_text("test-path")
 
-        assert result is None
+        assert result == "log line \ufffd ok"
 
-    def test_fetch_finished_json_not_found(self, mocker) -> None:
-        """Test _fetch_finished_json returns None when file not found."""
-        mocker.patch("prow_failure_analysis.gcs.client.storage")
-        client = GCSClient(bucket_name="test-bucket")
+    def test_fetch_many_blobs_downloads_concurrently(self, client, mocker) -> None:
+        """Test _fetch_many_blobs downloads on threads and maps failures to None."""
 
-        client._fetch_blob_text = mocker.Mock(return_value=None)
+        def download_many(blob_file_pairs, **kwargs):
+            results = []
+            for blob, buffer in blob_file_pairs:
+                if blob.name == "missing.xml":
+                    results.append(Exception("404 Not Found"))
+                else:
+                    buffer.write(f"<{blob.name}/>".encode())
+                    results.append(None)
+            return results
 
-        result = client._fetch_finished_json("base/path")
+        client.bucket.blob = lambda blob_path: _NamedBlob(blob_path)
+        download = mocker.patch(
+            "prow_failure_analysis.gcs.client.transfer_manager.download_many", side_effect=download_many
+        )
 
-        assert result is None
+        result = client._fetch_many_blobs(["a.xml", "missing.xml"])
+
+        assert result == {"a.xml": b"<a.xml/>", "missing.xml": None}
+        assert download.call_args.kwargs["worker_type"] == "thread"
 
-    def test_fetch_step_graph_success(self, mocker) -> None:
-        """Test _fetch_step_graph successfully fetches and parses JSON."""
-        mocker.patch("prow_failure_analysis.gcs.client.storage")
-        client = GCSClient(bucket_name="test-bucket")
+    def test_fetch_xunit_results_parses_fetched_files_together(self, client, mocker) -> None:
+        """Test _fetch_xunit_results hands every fetched file to one parse_many call."""
+        failing = b"""<testsuite><testcase name="test_a"><failure message="boom"/></testcase></testsuite>"""
+        client._list_xunit_files = mocker.Mock(return_value=["base/a/junit.xml", "base/b/junit_missing.xml"])
+        client._fetch_many_blobs = mocker.Mock(
+            return_value={"base/a/junit.xml": failing, "base/b/junit_missing.xml": None}
+        )
+        parse_many = mocker.spy(client.xunit_parser, "parse_many")
 
-        step_graph_content = json.dumps({"nodes": ["step1", "step2"], "edges": []})
+        result = client._fetch_xunit_results("base")
 
-        client._fetch_blob_text = mocker.Mock(return_value=step_graph_content)
+        assert [test.test_name for test in result] == ["test_a"]
+        parse_many.assert_called_once_with([(failing, "junit.xml")])
 
-        result = client._fetch_step_graph("base/path")
+    def test_fetch_xunit_results_isolates_bad_file(self, client, mocker) -> None:
+        """Test an unexpected error in one XUnit file keeps the other files' failures."""
+        failing = b"""<testsuite><testcase name="test_a"><failure message="boom"/></testcase></testsuite>"""
+        broken = b"""<testsuite><testcase name="test_b"><failure message="bad"/></testcase></testsuite>"""
+        client._list_xunit_files = mocker.Mock(return_value=["base/a/junit.xml", "base/b/junit_broken.xml"])
+        client._fetch_many_blobs = mocker.Mock(
+            return_value={"base/a/junit.xml": failing, "base/b/junit_broken.xml": broken}
+        )
+        parse_failed_tests = client.xunit_parser._parse_failed_tests
 
-        assert result == {"nodes": ["step1", "step2"], "edges": []}
-        client._fetch_blob_text.assert_called_once_with("base/path/artifacts/ci-operator-step-graph.json")
+        def parse_or_fail(data, source_path):
+            if source_path == "junit_broken.xml":
+                raise RuntimeError("unexpected")
+            return parse_failed_tests(data, source_path)
 
-    def test_fetch_step_graph_not_found(self, mocker) -> None:
-        """Test _fetch_step_graph returns empty dict when file not found."""
-        mocker.patch("prow_failure_analysis.gcs.client.storage")
-        client = GCSClient(bucket_name="test-bucket")
+        mocker.patch.object(client.xunit_parser, "_parse_failed_tests", side_effect=parse_or_fail)
 
-        client._fetch_blob_text = mocker.Mock(return_value=None)
+        result = client._fetch_xunit_results("base")
 
-        result = client._fetch_step_graph("base/path")
+        assert [test.test_name for test in result] == ["test_a"]
 
-        assert result == {}
+    def test_fetch_finished_json_not_found(self, client, mocker) -> None:
+        """Test _fetch_finished_json returns None when file not found."""
+        client._fetch_blob_bytes = mocker.Mock(return_value=None)
 
-    def test_fetch_step_graph_invalid_json(self, mocker) -> None:
-        """Test _fetch_step_graph returns empty dict for invalid JSON."""
-        mocker.patch("prow_failure_analysis.gcs.client.storage")
-        client = GCSClient(bucket_name="test-bucket")
+        result = client._fetch_finished_json("base/path")
+
+        assert result is None
 
-        client._fetch_blob_text = mocker.Mock(return_value="invalid json {")
+    @pytest.mark.parametrize(
+        ("returned", "expected"),
+        [
+            (_STEP_GRAPH_JSON, {"nodes": ["step1", "step2"], "edges": []}),
+            (None, {}),
+            (b"invalid json {", {}),
+        ],
+        ids=["success", "not-found", "invalid-json"],
+    )
+    def test_fetch_step_graph(self, client, mocker, returned, expected) -> None:
+        """Test _fetch_step_graph parses the step graph, or returns empty dict when missing or invalid."""
+        client._fetch_blob_bytes = mocker.Mock(return_value=returned)
 
         result = client._fetch_step_graph("base/path")
 
-        assert result == {}
+        assert result == expected
+        client._fetch_blob_bytes.assert_called_once_with("base/path/artifacts/ci-operator-step-graph.json")
 
-    def test_list_xunit_files_filters_by_pattern(self, mocker) -> None:
-        """Test _list_xunit_files filters files by expected patterns."""
-        mocker.patch("prow_failure_analysis.gcs.client.storage")
-        client = GCSClient(bucket_name="test-bucket")
+    def test_fetch_step_graph_cached_per_base_path(self, client, mocker) -> None:
+        """Test repeated _fetch_step_graph calls for one job download the graph once."""
+        client._fetch_blob_bytes = mocker.Mock(return_value=_STEP_GRAPH_JSON)
 
-        # Mock blobs - need to set name as an attribute
-        def create_blob(path: str):
-            blob = mocker.Mock()
-            blob.name = path
-            return blob
+        first = client._fetch_step_graph("base/path")
+        second = client._fetch_step_graph("base/path")
 
-        mock_blobs = [
-            create_blob("base/artifacts/stage/step/junit.xml"),
-            create_blob("base/artifacts/stage/step/junit-results.xml"),
-            create_blob("base/artifacts/stage/step/e2e-report.xml"),
-            create_blob("base/artifacts/stage/step/results/test-results.xml"),
-            create_blob("base/artifacts/stage/step/test-results/output.xml"),
-            create_blob("base/artifacts/stage/step/random-file.txt"),  # Should be ignored
-            create_blob("base/artifacts/stage/step/data.xml"),  # Should be ignored (no pattern match)
-        ]
+        assert first == second == {"nodes": ["step1", "step2"], "edges": []}
+        client._fetch_blob_bytes.assert_called_once()
 
-        client.client.list_blobs = mocker.Mock(return_value=mock_blobs)
+    @pytest.mark.parametrize("failed", [None, b"invalid json {"], ids=["not-found", "invalid-json"])
+    def test_fetch_step_graph_retries_after_failure(self, client, mocker, failed) -> None:
+        """Test a failed step graph fetch is not cached, so the next call downloads it again."""
+        client._fetch_blob_bytes = mocker.Mock(side_effect=[failed, _STEP_GRAPH_JSON])
+
+        first = client._fetch_step_graph("base/path")
+        second = client._fetch_step_graph("base/path")
+
+        assert first == {}
+        assert second == {"nodes": ["step1", "step2"], "edges": []}
+        assert client._fetch_blob_bytes.call_count == 2
+
+    def test_is_xunit_file_case_insensitive(self, client) -> None:
+        """Test _is_xunit_file matches fragments and suffix regardless of case."""
+        assert client._is_xunit_file("base/artifacts/stage/step/JUnit_Operator.XML") is True
+        assert client._is_xunit_file("base/artifacts/stage/step/Results/output.xml") is True
+        assert client._is_xunit_file("base/artifacts/stage/step/junit.xml.gz") is False
+
+    def test_list_xunit_files_filters_by_pattern(self, client, mocker, xunit_blobs, fake_list_blobs) -> None:
+        """Test _list_xunit_files filters files by expected patterns."""
+        client.client.list_blobs = mocker.Mock(side_effect=fake_list_blobs(xunit_blobs))
         client._verify_blob_exists = mocker.Mock(return_value=True)
 
         result = client._list_xunit_files("base")
 
         # Should include files matching patterns: junit, report, results, test-results
-        assert len(result) == 5
+        client._verify_blob_exists.assert_not_called()
+        assert len(result) == 9
+        assert "base/artifacts/junit_operator.xml" in result
+        assert "base/artifacts/other-stage/step/junit.xml" in result
         assert "base/artifacts/stage/step/junit.xml" in result
         assert "base/artifacts/stage/step/junit-results.xml" in result
         assert "base/artifacts/stage/step/e2e-report.xml" in result
         assert "base/artifacts/stage/step/results/test-results.xml" in result
         assert "base/artifacts/stage/step/test-results/output.xml" in result
+        assert "base/artifacts/stage/allowed-step/junit.xml" in result
+        assert "base/artifacts/stage/filtered-step/junit.xml" in result
 
-    def test_list_xunit_files_respects_config_filter(self, mocker) -> None:
-        """Test _list_xunit_files respects config step filtering."""
-        mocker.patch("prow_failure_analysis.gcs.client.storage")
-        mock_config = mocker.Mock()
-        mock_config.should_ignore_step.side_effect = lambda step: step == "stage/filtered-step"
-
-        client = GCSClient(bucket_name="test-bucket", config=mock_config)
+    def test_list_xunit_files_lists_each_stage_separately(self, client, mocker, xunit_blobs, fake_list_blobs) -> None:
+        """Test _list_xunit_files lists the top level with a delimiter, then each stage by name only."""
+        client.client.list_blobs = mocker.Mock(side_effect=fake_list_blobs(xunit_blobs))
 
-        # Mock blobs - need to set name as an attribute
-        def create_blob(path: str):
-            blob = mocker.Mock()
-            blob.name = path
-            return blob
+        client._list_xunit_files("base")
 
-        mock_blobs = [
-            create_blob("base/artifacts/stage/allowed-step/junit.xml"),
-            create_blob("base/artifacts/stage/filtered-step/junit.xml"),  # Should be filtered
+        top_level, *stage_calls = client.client.list_blobs.call_args_list
+        assert top_level == mocker.call(
+            "test-bucket", prefix="base/artifacts/", delimiter="/", fields="items(name),prefixes,nextPageToken"
+        )
+        # Stage listings run concurrently, so compare them order-independently
+        assert sorted(stage_calls, key=lambda c: c.kwargs["prefix"]) == [
+            mocker.call("test-bucket", prefix="base/artifacts/other-stage/", fields="items(name),nextPageToken"),
+            mocker.call("test-bucket", prefix="base/artifacts/stage/", fields="items(name),nextPageToken"),
         ]
 
-        client.client.list_blobs = mocker.Mock(return_value=mock_blobs)
+    def test_list_xunit_files_respects_config_filter(self, mocker, xunit_blobs, fake_list_blobs) -> None:
+        """Test _list_xunit_files respects config step filtering."""
+        client = GCSClient(bucket_name="test-bucket", config=_StepFilterConfig(), client=mocker.Mock())
+
+        client.client.list_blobs = mocker.Mock(side_effect=fake_list_blobs(xunit_blobs))
         client._verify_blob_exists = mocker.Mock(return_value=True)
 
         result = client._list_xunit_files("base")
 
-        # Should only include the allowed step
-        assert len(result) == 1
+        # Only the ignored step is dropped
+        assert len(result) == 8
         assert "base/artifacts/stage/allowed-step/junit.xml" in result
+        assert "base/artifacts/stage/filtered-step/junit.xml" not in result
+
+    def test_list_xunit_files_strict_verify(self, mocker, xunit_blobs, fake_list_blobs) -> None:
+        """Test strict_verify checks existence only for unfiltered files and drops missing ones."""
+        client = GCSClient(bucket_name="test-bucket", config=_StepFilterConfig(), client=mocker.Mock())
+        missing = "base/artifacts/stage/step/junit.xml"
+
+        client.client.list_blobs = mocker.Mock(side_effect=fake_list_blobs(xunit_blobs))
+        client._verify_blob_exists = mocker.Mock(side_effect=lambda name: name != missing)
 
-    def test_fetch_artifacts_for_pattern_excludes_matching_artifacts(self, mocker) -> None:
+        result = client._list_xunit_files("base", strict_verify=True)
+
+        verified = [call.args[0] for call in client._verify_blob_exists.call_args_list]
+        assert len(verified) == 8
+        # Filtered steps are dropped before any existence round-trip
+        assert "base/artifacts/stage/filtered-step/junit.xml" not in verified
+        assert missing not in result
+        assert len(result) == 7
+
+    def test_fetch_artifacts_for_pattern_excludes_matching_artifacts(self, mocker, blob_factory) -> None:
         """Test _fetch_artifacts_for_pattern skips artifacts that match exclude patterns."""
-        mocker.patch("prow_failure_analysis.gcs.client.storage")
         config = Config()
         config.excluded_artifacts_patterns = ["cert-manager*", "openshift-*", "!openshift-pipelines*"]
-        client = GCSClient(bucket_name="test-bucket", config=config)
+        client = GCSClient(bucket_name="test-bucket", config=config, client=mocker.Mock())
 
         artifacts_prefix = "logs/job/123/artifacts/"
-
-        def create_blob(name: str):
-            blob = mocker.Mock()
-            blob.name = name
-            return blob
-
         mock_blobs = [
-            create_blob(f"{artifacts_prefix}e2e/gather/pods/cert-manager-controller-abc/log.txt"),
-            create_blob(f"{artifacts_prefix}e2e/gather/pods/openshift-console-xyz/log.txt"),
-            create_blob(f"{artifacts_prefix}e2e/gather/pods/openshift-pipelines-ctrl-abc/log.txt"),
-            create_blob(f"{artifacts_prefix}e2e/gather/pods/my-app-service/log.txt"),
+            blob_factory(f"{artifacts_prefix}e2e/gather/pods/cert-manager-controller-abc/log.txt"),
+            blob_factory(f"{artifacts_prefix}e2e/gather/pods/openshift-console-xyz/log.txt"),
+            blob_factory(f"{artifacts_prefix}e2e/gather/pods/openshift-pipelines-ctrl-abc/log.txt"),
+            blob_factory(f"{artifacts_prefix}e2e/gather/pods/my-app-service/log.txt"),
         ]
 
         client.client.list_blobs = mocker.Mock(return_value=mock_blobs)
@@ -241,21 +334,12 @@ class TestGCSClient:
         # _fetch_blob_text should only be called for the 2 non-excluded artifacts
         assert client._fetch_blob_text.call_count == 2
 
-    def test_fetch_artifacts_for_pattern_no_exclusion_without_config(self, mocker) -> None:
+    def test_fetch_artifacts_for_pattern_no_exclusion_without_config(self, client, mocker, blob_factory) -> None:
         """Test _fetch_artifacts_for_pattern fetches all artifacts when no config/exclusion set."""
-        mocker.patch("prow_failure_analysis.gcs.client.storage")
-        client = GCSClient(bucket_name="test-bucket")
-
         artifacts_prefix = "logs/job/123/artifacts/"
-
-        def create_blob(name: str):
-            blob = mocker.Mock()
-            blob.name = name
-            return blob
-
         mock_blobs = [
-            create_blob(f"{artifacts_prefix}e2e/gather/pods/cert-manager-abc/log.txt"),
-            create_blob(f"{artifacts_prefix}e2e/gather/pods/my-service/log.txt"),
+            blob_factory(f"{artifacts_prefix}e2e/gather/pods/cert-manager-abc/log.txt"),
+            blob_factory(f"{artifacts_prefix}e2e/gather/pods/my-service/log.txt"),
         ]
 
         client.client.list_blobs = mocker.Mock(return_value=mock_blobs)
@@ -267,3 +351,6 @@ class TestGCSClient:
         assert matched == 2
         assert "e2e/gather/pods/cert-manager-abc/log.txt" in artifacts
         assert "e2e/gather/pods/my-service/log.txt" in artifacts
+        client.client.list_blobs.assert_called_once_with(
+            "test-bucket", prefix=f"{artifacts_prefix}e2e/gather/pods/", fields="items(name),nextPageToken"
+        )
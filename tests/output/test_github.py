@@ -2,6 +2,8 @@ from prow_failure_analysis.analysis.analyzer import RCAReport, StepAnalysis
 from prow_failure_analysis.output.github import (
     BOT_COMMENT_MARKER,
     _find_existing_bot_comment,
+    get_github_client,
+    get_github_repo,
     post_pr_comment,
 )
 
@@ -15,6 +17,9 @@ def _make_mock_pr(mocker, existing_comments=None):
 
 def _setup_github_mocks(mocker, existing_comments=None):
     """Set up common GitHub mocks and return (mock_g, mock_pr)."""
+    get_github_client.cache_clear()
+    get_github_repo.cache_clear()
+    mocker.patch("prow_failure_analysis.output.github.atexit")
     mocker.patch("prow_failure_analysis.output.github.Auth")
     mock_github = mocker.patch("prow_failure_analysis.output.github.Github")
 
@@ -106,6 +111,28 @@ class TestPostPRComment:
 
         mock_g.get_repo.assert_called_once_with("kubernetes/kubernetes")
 
+    def test_org_repo_conversion_keeps_repo_underscores(self, mocker):
+        """Test only the org separator is converted, leaving underscores in the repo name."""
+        mock_g, _ = _setup_github_mocks(mocker)
+
+        report = _make_report()
+        post_pr_comment("fake-token", "my-org_my_repo", 123, report)
+        post_pr_comment("fake-token", "my-org/my_repo", 124, report)
+
+        # Both spellings resolve to the same repo, so the second call hits the lookup cache
+        mock_g.get_repo.assert_called_once_with("my-org/my_repo")
+
+    def test_repo_lookup_reused_across_calls(self, mocker):
+        """Test repeated comments on the same repo look it up once."""
+        mock_g, mock_pr = _setup_github_mocks(mocker)
+
+        report = _make_report()
+        post_pr_comment("fake-token", "org/repo", 123, report)
+        post_pr_comment("fake-token", "org/repo", 124, report)
+
+        mock_g.get_repo.assert_called_once_with("org/repo")
+        assert mock_pr.create_issue_comment.call_count == 2
+
     def test_comment_body_includes_category(self, mocker):
         """Test comment body includes category."""
         _, mock_pr = _setup_github_mocks(mocker)
@@ -154,14 +181,27 @@ class TestPostPRComment:
         assert "🔍 Failed Steps" not in call_args
         assert "Test failed" in call_args
 
-    def test_github_client_closed(self, mocker):
-        """Test GitHub client is properly closed."""
+    def test_github_client_closed_at_exit(self, mocker):
+        """Test GitHub client is closed at interpreter exit rather than per call."""
         mock_g, _ = _setup_github_mocks(mocker)
+        mock_atexit = mocker.patch("prow_failure_analysis.output.github.atexit")
+
+        report = _make_report()
+        post_pr_comment("fake-token", "org/repo", 123, report)
+
+        mock_g.close.assert_not_called()
+        mock_atexit.register.assert_called_once_with(mock_g.close)
+
+    def test_github_client_reused_across_calls(self, mocker):
+        """Test repeated comments with the same token share one GitHub client."""
+        _setup_github_mocks(mocker)
+        mock_github = mocker.patch("prow_failure_analysis.output.github.Github")
 
         report = _make_report()
         post_pr_comment("fake-token", "org/repo", 123, report)
+        post_pr_comment("fake-token", "org/repo", 124, report)
 
-        mock_g.close.assert_called_once()
+        mock_github.assert_called_once()
 
     def test_updates_existing_comment_in_place(self, mocker):
         """Existing bot comment is edited in place, not deleted+recreated."""
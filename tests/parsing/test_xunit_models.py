@@ -1,3 +1,7 @@
+import dataclasses
+
+import pytest
+
 from prow_failure_analysis.parsing.xunit_models import FailedTest
 
 
@@ -151,3 +155,24 @@ class TestFailedTest:
             source_file="test.xml",
         )
         assert failed_test.combined_details == "No additional details available"
+
+    def test_failed_test_is_immutable(self) -> None:
+        """Test FailedTest is frozen and slotted."""
+        failed_test = FailedTest(
+            test_name="test_method",
+            class_name=None,
+            test_id=None,
+            failure_type=None,
+            failure_message=None,
+            failure_content=None,
+            error_type=None,
+            error_message=None,
+            error_content=None,
+            system_out=None,
+            system_err=None,
+            source_file="test.xml",
+        )
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            failed_test.test_name = "other"  # type: ignore[misc]
+        assert not hasattr(failed_test, "__dict__")
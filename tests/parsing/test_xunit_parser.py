@@ -1,14 +1,19 @@
 import pytest
 
+from prow_failure_analysis.parsing import xunit_parser
 from prow_failure_analysis.parsing.xunit_parser import XUnitParser
 
 
 class TestXUnitParser:
     """Tests for XUnitParser class."""
 
-    @pytest.fixture
-    def parser(self) -> XUnitParser:
-        """Create a parser instance for tests."""
+    @pytest.fixture(params=["lxml", "stdlib"])
+    def parser(self, request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> XUnitParser:
+        """Create a parser instance for tests, once per XML backend."""
+        if request.param == "lxml":
+            pytest.importorskip("lxml")
+        else:
+            monkeypatch.setattr(xunit_parser, "lxml_etree", None)
         return XUnitParser()
 
     def test_parse_simple_failure(self, parser: XUnitParser) -> None:
@@ -108,6 +113,21 @@ class TestXUnitParser:
         assert results[0].test_name == "test_a"
         assert results[1].test_name == "test_b"
 
+    def test_parse_failure_text_stops_at_first_subelement(self, parser: XUnitParser) -> None:
+        """Test failure content is the text before any nested element, and only the first failure counts."""
+        xml_content = """<testsuite>
+    <testcase name="test_nested_markup">
+        <failure type="First">leading text<detail>inner</detail>trailing text</failure>
+        <failure type="Second">ignored</failure>
+    </testcase>
+</testsuite>"""
+
+        results = parser.parse_xunit_file(xml_content, "markup.xml")
+
+        assert len(results) == 1
+        assert results[0].failure_type == "First"
+        assert results[0].failure_content == "leading text"
+
     def test_parse_with_system_out_and_err(self, parser: XUnitParser) -> None:
         """Test parsing test case with system-out and system-err."""
         xml_content = """<?xml version="1.0" encoding="UTF-8"?>
@@ -159,6 +179,34 @@ class TestXUnitParser:
 
         assert len(results) == 0
 
+    def test_parse_trusts_failure_elements_over_root_counts(self, parser: XUnitParser) -> None:
+        """Test that failures are reported even when the root's counters claim there are none."""
+        xml_content = """<?xml version="1.0" encoding="UTF-8"?>
+<testsuite name="MergedSuite" tests="1" failures="0" errors="0">
+    <testcase name="test_one">
+        <failure message="not counted by the generator">Details</failure>
+    </testcase>
+</testsuite>"""
+
+        results = parser.parse_xunit_file(xml_content, "merged.xml")
+
+        assert [test.test_name for test in results] == ["test_one"]
+
+    def test_parse_finds_nested_error_under_zero_failure_root(self, parser: XUnitParser) -> None:
+        """Test that an error in a nested suite is found when the root reports no failures."""
+        xml_content = """<?xml version="1.0" encoding="UTF-8"?>
+<testsuites failures="0">
+    <testsuite name="Suite1" failures="0" errors="1">
+        <testcase name="test_a">
+            <error message="Error">Details</error>
+        </testcase>
+    </testsuite>
+</testsuites>"""
+
+        results = parser.parse_xunit_file(xml_content, "partial.xml")
+
+        assert [test.test_name for test in results] == ["test_a"]
+
     def test_parse_empty_text_elements(self, parser: XUnitParser) -> None:
         """Test that empty or whitespace-only text elements return None."""
         xml_content = """<?xml version="1.0" encoding="UTF-8"?>
@@ -185,6 +233,19 @@ class TestXUnitParser:
 
         assert len(results) == 0
 
+    def test_parse_truncated_xml_returns_empty(self, parser: XUnitParser) -> None:
+        """Test that a document broken after valid testcases still returns an empty list."""
+        xml_content = """<?xml version="1.0" encoding="UTF-8"?>
+<testsuite name="TestSuite">
+    <testcase name="test_one">
+        <failure message="Failed">Details</failure>
+    </testcase>
+    <testcase name="test_two">"""
+
+        results = parser.parse_xunit_file(xml_content, "truncated.xml")
+
+        assert results == []
+
     def test_parse_both_failure_and_error(self, parser: XUnitParser) -> None:
         """Test parsing a test case with both failure and error elements."""
         xml_content = """<?xml version="1.0" encoding="UTF-8"?>
@@ -253,9 +314,9 @@ class TestXUnitParser:
         assert len(results) == 2
         assert all(test.source_file == source_path for test in results)
 
-    def test_get_element_text_with_none(self, parser: XUnitParser) -> None:
-        """Test _get_element_text with None element."""
-        result = parser._get_element_text(None)
+    def test_clean_text_with_none(self) -> None:
+        """Test _clean_text with no captured text."""
+        result = xunit_parser._clean_text(None)
         assert result is None
 
     def test_parse_multiline_content(self, parser: XUnitParser) -> None:
@@ -279,3 +340,104 @@ class TestXUnitParser:
         assert "Line 1 of failure" in failed_test.failure_content
         assert "Line 2 of failure" in failed_test.failure_content
         assert "Line 3 of failure" in failed_test.failure_content
+
+    def test_parse_non_ascii_content(self, parser: XUnitParser) -> None:
+        """Test that non-ASCII text survives parsing with an encoding declaration."""
+        xml_content = """<?xml version="1.0" encoding="UTF-8"?>
+<testsuite name="TestSuite">
+    <testcase name="test_unicode">
+        <failure message="Ошибка ✗">Überprüfung fehlgeschlagen</failure>
+    </testcase>
+</testsuite>"""
+
+        results = parser.parse_xunit_file(xml_content, "unicode.xml")
+
+        assert len(results) == 1
+        assert results[0].failure_message == "Ошибка ✗"
+        assert results[0].failure_content == "Überprüfung fehlgeschlagen"
+
+    def test_parse_many_matches_sequential_parse(self, parser: XUnitParser, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that parsing in worker processes returns the same per-file results in order."""
+        monkeypatch.setattr(xunit_parser, "_MIN_PARALLEL_PARSE_BYTES", 0)
+        monkeypatch.setattr(xunit_parser.os, "cpu_count", lambda: 2)
+        documents = [
+            (
+                f"""<testsuite><testcase name="test_{i}" classname="Suite{i}">
+                <failure message="Failed {i}">Details {i}</failure></testcase></testsuite>""".encode(),
+                f"junit_{i}.xml",
+            )
+            for i in range(3)
+        ]
+        documents.append((b"<testsuite><testcase name='passing'/></testsuite>", "passing.xml"))
+
+        results = parser.parse_many(documents)
+
+        assert results == [parser.parse_xunit_bytes(data, source) for data, source in documents]
+        assert [len(failed) for failed in results] == [1, 1, 1, 0]
+
+    def test_parse_many_small_batch_stays_in_process(self, parser: XUnitParser, mocker) -> None:
+        """Test that small batches never start a process pool."""
+        pool = mocker.patch.object(xunit_parser, "ProcessPoolExecutor")
+
+        results = parser.parse_many([(b"<testsuite/>", "a.xml"), (b"<testsuite/>", "b.xml")])
+
+        assert results == [[], []]
+        pool.assert_not_called()
+
+    def test_parse_interns_repeated_attributes(self, parser: XUnitParser) -> None:
+        """Test that class names and failure types shared by testcases are a single string object."""
+        xml_content = """<testsuite>
+    <testcase name="test_one" classname="com.example.Shared"><failure type="AssertionError"/></testcase>
+    <testcase name="test_two" classname="com.example.Shared"><failure type="AssertionError"/></testcase>
+</testsuite>"""
+
+        first, second = parser.parse_xunit_file(xml_content, "shared.xml")
+
+        assert first.class_name is second.class_name
+        assert first.failure_type is second.failure_type
+
+    @pytest.mark.parametrize("encoding", ["ISO-8859-1", "UTF-16"])
+    def test_parse_str_ignores_declared_encoding(self, parser: XUnitParser, encoding: str) -> None:
+        """Test already-decoded text parses correctly whatever encoding its declaration names."""
+        xml_content = f"""<?xml version="1.0" encoding="{encoding}"?>
+<testsuite>
+    <testcase name="test_decoded"><failure message="Prüfung fehlgeschlagen">Größe</failure></testcase>
+</testsuite>"""
+
+        results = parser.parse_xunit_file(xml_content, "decoded.xml")
+
+        assert len(results) == 1
+        assert results[0].failure_message == "Prüfung fehlgeschlagen"
+        assert results[0].failure_content == "Größe"
+
+    def test_parse_xunit_bytes_honours_declared_encoding(self, parser: XUnitParser) -> None:
+        """Test raw bytes are decoded using the document's encoding declaration."""
+        xml_content = """<?xml version="1.0" encoding="ISO-8859-1"?>
+<testsuite>
+    <testcase name="test_latin1"><failure message="Prüfung fehlgeschlagen">Größe</failure></testcase>
+</testsuite>""".encode("iso-8859-1")
+
+        results = parser.parse_xunit_bytes(xml_content, "latin1.xml")
+
+        assert len(results) == 1
+        assert results[0].failure_message == "Prüfung fehlgeschlagen"
+        assert results[0].failure_content == "Größe"
+
+    def test_parse_utf16_document_is_not_byte_scanned(self, parser: XUnitParser) -> None:
+        """Test failures in UTF-16 documents are still found, since the byte scan can't see their tags."""
+        xml_content = """<?xml version="1.0" encoding="UTF-16"?>
+<testsuite><testcase name="test_wide"><failure message="Failed"/></testcase></testsuite>""".encode("utf-16")
+
+        results = parser.parse_xunit_bytes(xml_content, "wide.xml")
+
+        assert [test.test_name for test in results] == ["test_wide"]
+
+    def test_parse_without_failure_tags_skips_parser(self, parser: XUnitParser, mocker) -> None:
+        """Test documents with no failure or error start tags never reach the XML parser."""
+        parse = mocker.spy(parser, "_parse_failed_tests")
+        xml_content = """<testsuite failures="3"><testcase name="test_one"/><testcase name="test_two"/></testsuite>"""
+
+        results = parser.parse_xunit_file(xml_content, "passing.xml")
+
+        assert results == []
+        parse.assert_not_called()
@@ -1,8 +1,7 @@
-import tempfile
-from pathlib import Path
+import pytest
 
 from prow_failure_analysis.constants import CHARS_PER_TOKEN
-from prow_failure_analysis.processing.preprocessor import LogPreprocessor
+from prow_failure_analysis.processing.preprocessor import _MAX_CACHED_TEXT_CHARS, LogPreprocessor, _read_mapped_text
 
 
 class TestLogPreprocessor:
@@ -30,6 +29,62 @@ class TestLogPreprocessor:
 
         assert tokens == 5
 
+    def test_estimate_tokens_caches_repeated_lines(self, mocker):
+        """Test that repeated short lines are tokenized once per preprocessor."""
+        mock_vectorizer = mocker.Mock()
+        mock_vectorizer.model.tokenizer.encode.return_value = [1, 2, 3]
+        mocker.patch("prow_failure_analysis.processing.preprocessor.create_vectorizer", return_value=mock_vectorizer)
+        preprocessor = LogPreprocessor()
+
+        counts = [preprocessor._estimate_tokens("INFO repeated line") for _ in range(5)]
+
+        assert counts == [3] * 5
+        mock_vectorizer.model.tokenizer.encode.assert_called_once()
+
+    def test_estimate_tokens_long_text_not_cached(self, mocker):
+        """Test that texts above the cache cutoff are tokenized on every call."""
+        mock_vectorizer = mocker.Mock()
+        mock_vectorizer.model.tokenizer.encode.return_value = [1, 2]
+        mocker.patch("prow_failure_analysis.processing.preprocessor.create_vectorizer", return_value=mock_vectorizer)
+        preprocessor = LogPreprocessor()
+
+        text = "a" * (_MAX_CACHED_TEXT_CHARS + 1)
+        preprocessor._estimate_tokens(text)
+        preprocessor._estimate_tokens(text)
+
+        assert mock_vectorizer.model.tokenizer.encode.call_count == 2
+
+    def test_token_cache_evicts_oldest_half(self, mocker):
+        """Test that a full token cache drops its oldest entries first."""
+        mocker.patch("prow_failure_analysis.processing.preprocessor._MAX_TOKEN_CACHE_ENTRIES", 4)
+        mock_vectorizer = mocker.Mock()
+        mock_vectorizer.model.tokenizer.encode.return_value = [1]
+        mocker.patch("prow_failure_analysis.processing.preprocessor.create_vectorizer", return_value=mock_vectorizer)
+        preprocessor = LogPreprocessor()
+
+        for line in ["a", "b", "c", "d", "e"]:
+            preprocessor._estimate_tokens(line)
+
+        assert list(preprocessor._token_cache) == ["c", "d", "e"]
+
+    def test_sampled_lines_reuse_cached_counts(self, mocker):
+        """Test that lines sampled once are never tokenized again by either estimation path."""
+        mock_vectorizer = mocker.Mock()
+        tokenizer = mock_vectorizer.model.tokenizer
+        tokenizer.side_effect = lambda texts, **_: {"input_ids": [[0] * len(text) for text in texts]}
+        mocker.patch("prow_failure_analysis.processing.preprocessor.create_vectorizer", return_value=mock_vectorizer)
+        preprocessor = LogPreprocessor()
+        long_line = "x" * (_MAX_CACHED_TEXT_CHARS + 1)
+        lines = ["step started", "step failed", long_line]
+
+        preprocessor._calculate_max_line_tokens(lines)
+        preprocessor._calculate_max_line_tokens(lines[:2])
+
+        assert tokenizer.call_count == 1
+        assert preprocessor._estimate_tokens("step failed") == len("step failed")
+        tokenizer.encode.assert_not_called()
+        assert long_line not in preprocessor._token_cache
+
     def test_calculate_max_line_tokens_empty_lines(self, mocker):
         """Test max line tokens returns default for empty lines."""
         mocker.patch("prow_failure_analysis.processing.preprocessor.create_vectorizer")
@@ -41,14 +96,49 @@ class TestLogPreprocessor:
 
     def test_calculate_max_line_tokens_samples_lines(self, mocker):
         """Test max line tokens samples and finds maximum."""
-        mocker.patch("prow_failure_analysis.processing.preprocessor.create_vectorizer")
+        mock_vectorizer = mocker.Mock()
+        mock_vectorizer.model.tokenizer.side_effect = lambda texts, **_: {
+            "input_ids": [[0] * (len(text) // CHARS_PER_TOKEN) for text in texts]
+        }
+        mocker.patch("prow_failure_analysis.processing.preprocessor.create_vectorizer", return_value=mock_vectorizer)
         preprocessor = LogPreprocessor()
-        preprocessor._estimate_tokens = mocker.Mock(side_effect=lambda x: len(x) // CHARS_PER_TOKEN)
 
         lines = ["short", "a" * 100, "medium text here", "a" * 200, "tiny"]
         max_tokens = preprocessor._calculate_max_line_tokens(lines)
 
         assert max_tokens == 200 // CHARS_PER_TOKEN
+        mock_vectorizer.model.tokenizer.assert_called_once()
+        mock_vectorizer.model.tokenizer.encode.assert_not_called()
+
+    def test_estimate_tokens_batch_reuses_cached_lines(self, mocker):
+        """Test that batched estimation only tokenizes lines it has not seen before."""
+        mock_vectorizer = mocker.Mock()
+        mock_vectorizer.model.tokenizer.side_effect = lambda texts, **_: {
+            "input_ids": [[0] * len(text) for text in texts]
+        }
+        mocker.patch("prow_failure_analysis.processing.preprocessor.create_vectorizer", return_value=mock_vectorizer)
+        preprocessor = LogPreprocessor()
+
+        first = preprocessor._estimate_tokens_batch(["INFO ready", "WARN retry", "INFO ready"])
+        second = preprocessor._estimate_tokens_batch(["WARN retry", "ERROR failed", "INFO ready"])
+
+        assert first == [10, 10, 10]
+        assert second == [10, 12, 10]
+        assert [call.args[0] for call in mock_vectorizer.model.tokenizer.call_args_list] == [
+            ["INFO ready", "WARN retry"],
+            ["ERROR failed"],
+        ]
+
+    def test_calculate_max_line_tokens_fallback(self, mocker):
+        """Test max line tokens falls back to char-based estimation without a tokenizer."""
+        mocker.patch(
+            "prow_failure_analysis.processing.preprocessor.create_vectorizer", return_value=mocker.Mock(spec=[])
+        )
+        preprocessor = LogPreprocessor()
+
+        max_tokens = preprocessor._calculate_max_line_tokens(["short", "a" * 200, ""])
+
+        assert max_tokens == 200 // CHARS_PER_TOKEN
 
     def test_preprocess_file_not_found(self, mocker):
         """Test preprocess_file returns empty string for missing file."""
@@ -59,23 +149,37 @@ class TestLogPreprocessor:
 
         assert result == ""
 
-    def test_preprocess_file_below_threshold(self, mocker):
+    def test_preprocess_file_below_threshold(self, mocker, tmp_path):
         """Test preprocess_file skips preprocessing for small files."""
         mocker.patch("prow_failure_analysis.processing.preprocessor.create_vectorizer")
         preprocessor = LogPreprocessor()
         preprocessor.size_threshold = 1000
 
-        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".log") as f:
-            f.write("small log content")
-            temp_path = f.name
+        log = tmp_path / "step.log"
+        log.write_text("small log content")
+
+        result = preprocessor.preprocess_file(str(log))
+
+        assert result == "small log content"
+
+    def test_vectorizer_created_lazily_once(self, mocker, tmp_path):
+        """Test the embedding model is only loaded when a log actually needs it, and only once."""
+        create_vectorizer = mocker.patch(
+            "prow_failure_analysis.processing.preprocessor.create_vectorizer", return_value=mocker.Mock(spec=[])
+        )
+        preprocessor = LogPreprocessor()
+        preprocessor.size_threshold = 1000
+
+        log = tmp_path / "step.log"
+        log.write_text("small log content")
+        preprocessor.preprocess_file(str(log))
+        create_vectorizer.assert_not_called()
 
-        try:
-            result = preprocessor.preprocess_file(temp_path)
-            assert result == "small log content"
-        finally:
-            Path(temp_path).unlink()
+        preprocessor._estimate_tokens("a line")
+        preprocessor._estimate_tokens("another line")
+        create_vectorizer.assert_called_once()
 
-    def test_preprocess_file_under_token_limit(self, mocker):
+    def test_preprocess_file_under_token_limit(self, mocker, tmp_path):
         """Test preprocess_file skips preprocessing when under token limit."""
         mocker.patch("prow_failure_analysis.processing.preprocessor.create_vectorizer")
         preprocessor = LogPreprocessor()
@@ -83,15 +187,39 @@ class TestLogPreprocessor:
         preprocessor.max_tokens = 1000
 
         content = "a" * 2000  # ~500 tokens, well under limit
-        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".log") as f:
-            f.write(content)
-            temp_path = f.name
+        log = tmp_path / "step.log"
+        log.write_text(content)
+        estimate_tokens = mocker.spy(preprocessor, "_estimate_tokens")
 
-        try:
-            result = preprocessor.preprocess_file(temp_path)
-            assert result == content
-        finally:
-            Path(temp_path).unlink()
+        result = preprocessor.preprocess_file(str(log))
+
+        assert result == content
+        estimate_tokens.assert_not_called()
+
+    def test_preprocess_file_keeps_final_lines(self, mocker, tmp_path):
+        """Test the last lines bypass cordon and are appended after the reduced content."""
+        mocker.patch(
+            "prow_failure_analysis.processing.preprocessor.create_vectorizer", return_value=mocker.Mock(spec=[])
+        )
+        preprocessor = LogPreprocessor(last_lines_to_keep=2)
+        preprocessor.size_threshold = 10
+        run_cordon = mocker.patch.object(preprocessor, "_run_cordon_analysis", return_value="reduced\n")
+
+        log = tmp_path / "step.log"
+        log.write_text("\n".join(f"line {i}" for i in range(200)))
+
+        result = preprocessor.preprocess_file(str(log), max_tokens=10)
+
+        processed = run_cordon.call_args.args[0]
+        assert processed == "\n".join(f"line {i}" for i in range(198))
+        assert result == "reduced\n\n--- FINAL OUTPUT ---\nline 198\nline 199"
+
+    def test_read_mapped_text_matches_read_text(self, tmp_path):
+        """Test the memory-mapped read decodes and translates newlines like read_text."""
+        log = tmp_path / "crlf.log"
+        log.write_bytes("first\r\nsecond\rthird ✓\n".encode())
+
+        assert _read_mapped_text(log) == log.read_text() == "first\nsecond\nthird ✓\n"
 
     def test_init_with_config(self, mocker):
         """Test initialization with config auto-detects settings."""
@@ -122,14 +250,51 @@ class TestLogPreprocessor:
         assert preprocessor.size_threshold == 50_000
 
     def test_preprocess_memory_to_file(self, mocker):
-        """Test preprocess method writes to temp file and calls preprocess_file."""
+        """Test preprocess writes oversized content to a temp file and calls preprocess_file."""
+        mocker.patch("prow_failure_analysis.processing.preprocessor.create_vectorizer")
+        preprocessor = LogPreprocessor()
+        preprocessor.size_threshold = 10
+        preprocessor.max_tokens = 1
+        preprocess_file = mocker.patch.object(preprocessor, "preprocess_file", return_value="reduced")
+
+        result = preprocessor.preprocess("content over the threshold")
+
+        assert result == "reduced"
+        preprocess_file.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "content,expected",
+        [
+            ("small content", "small content"),
+            ("line one\r\nline two\rline three", "line one\nline two\nline three"),
+        ],
+        ids=["plain", "carriage-returns"],
+    )
+    def test_preprocess_small_content_skips_temp_file(self, mocker, content, expected):
+        """Test small content is returned in memory, matching what a file round-trip would produce."""
         mocker.patch("prow_failure_analysis.processing.preprocessor.create_vectorizer")
         preprocessor = LogPreprocessor()
         preprocessor.size_threshold = 1000
+        named_temp = mocker.patch("prow_failure_analysis.processing.preprocessor.tempfile.NamedTemporaryFile")
+
+        result = preprocessor.preprocess(content)
+
+        assert result == expected
+        named_temp.assert_not_called()
+
+    def test_preprocess_measures_non_ascii_content_in_bytes(self, mocker):
+        """Test multi-byte content is sized in UTF-8 bytes, not characters."""
+        mocker.patch("prow_failure_analysis.processing.preprocessor.create_vectorizer")
+        preprocessor = LogPreprocessor()
+        preprocessor.size_threshold = 20
+        preprocessor.max_tokens = 1
+        preprocess_file = mocker.patch.object(preprocessor, "preprocess_file", return_value="reduced")
 
-        result = preprocessor.preprocess("small content")
+        # 12 characters, but 24 bytes in UTF-8
+        result = preprocessor.preprocess("ÜÜÜÜÜÜÜÜÜÜÜÜ")
 
-        assert result == "small content"
+        assert result == "reduced"
+        preprocess_file.assert_called_once()
 
     def test_init_with_remote_backend_config(self, mocker):
         """Test initialization with remote backend config."""
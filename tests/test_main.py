@@ -1,12 +1,21 @@
 """Unit tests for main module."""
 
+import pytest
+
 from prow_failure_analysis.config import Config
-from prow_failure_analysis.main import configure_dspy
+from prow_failure_analysis.main import _build_lm, configure_dspy
 
 
 class TestConfigureDSPy:
     """Tests for DSPy configuration."""
 
+    @pytest.fixture(autouse=True)
+    def clear_lm_cache(self):
+        """Drop LMs cached by earlier tests so each test sees fresh constructor calls."""
+        _build_lm.cache_clear()
+        yield
+        _build_lm.cache_clear()
+
     def test_configure_dspy_with_api_key(self, mocker):
         """Test configure_dspy includes api_key when set."""
         mock_lm = mocker.patch("prow_failure_analysis.main.dspy.LM")
@@ -49,3 +58,36 @@ class TestConfigureDSPy:
         configure_dspy(config)
 
         mock_lm.assert_called_once_with(model="ollama/llama3", api_base="http://localhost:11434")
+
+    def test_configure_dspy_reuses_lm_for_same_settings(self, mocker):
+        """Test configure_dspy builds one LM for repeated identical configs."""
+        mock_lm = mocker.patch("prow_failure_analysis.main.dspy.LM")
+        mock_configure = mocker.patch("prow_failure_analysis.main.dspy.configure")
+
+        config = Config()
+        config.llm_provider = "openai"
+        config.llm_model = "gpt-4"
+        config.llm_api_key = "test-key"
+
+        configure_dspy(config)
+        configure_dspy(config)
+
+        mock_lm.assert_called_once_with(model="openai/gpt-4", api_key="test-key")
+        assert mock_configure.call_count == 2
+
+    def test_configure_dspy_skips_when_lm_already_active(self, mocker):
+        """Test configure_dspy leaves DSPy alone when the same LM is already configured."""
+        mock_lm = mocker.patch("prow_failure_analysis.main.dspy.LM")
+        mock_configure = mocker.patch("prow_failure_analysis.main.dspy.configure")
+        mock_settings = mocker.patch("prow_failure_analysis.main.dspy.settings")
+
+        config = Config()
+        config.llm_provider = "openai"
+        config.llm_model = "gpt-4"
+        config.llm_api_key = "test-key"
+
+        configure_dspy(config)
+        mock_settings.lm = mock_lm.return_value
+        configure_dspy(config)
+
+        mock_configure.assert_called_once_with(lm=mock_lm.return_value)
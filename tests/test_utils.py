@@ -1,10 +1,11 @@
 """Tests for utility functions and decorators."""
 
+import threading
 from unittest.mock import Mock, patch
 
 import pytest
 
-from prow_failure_analysis.utils import retry_with_backoff
+from prow_failure_analysis.utils import RetryCancelledError, retry_with_backoff, translate_newlines
 
 
 class TestRetryWithBackoff:
@@ -181,3 +182,48 @@ class TestRetryWithBackoff:
 
         assert result == "success"
         mock_func.assert_called_once_with("arg1", kwarg="value")
+
+    def test_cancel_event_waits_instead_of_sleeping(self):
+        """Test that backoff waits on the cancel event when one is given."""
+        cancel_event = Mock(spec=threading.Event)
+        cancel_event.wait.return_value = False
+        mock_func = Mock(side_effect=[Exception("Temporary failure"), "success"])
+
+        with patch("time.sleep") as mock_sleep:
+            result = retry_with_backoff(max_retries=3, base_delay=2.0, cancel_event=cancel_event)(mock_func)()
+
+        assert result == "success"
+        cancel_event.wait.assert_called_once_with(2.0)
+        mock_sleep.assert_not_called()
+
+    def test_cancel_event_set_aborts_retry(self):
+        """Test that a set cancel event stops retrying immediately."""
+        cancel_event = threading.Event()
+        cancel_event.set()
+        mock_func = Mock(side_effect=Exception("Rate limit exceeded"))
+
+        decorated = retry_with_backoff(max_retries=3, cancel_event=cancel_event)(mock_func)
+
+        with pytest.raises(RetryCancelledError) as exc_info:
+            decorated()
+
+        assert mock_func.call_count == 1
+        assert str(exc_info.value.__cause__) == "Rate limit exceeded"
+
+
+class TestTranslateNewlines:
+    """Tests for the translate_newlines helper."""
+
+    @pytest.mark.parametrize(
+        "text,expected",
+        [
+            ("plain\ntext", "plain\ntext"),
+            ("windows\r\nline\r\n", "windows\nline\n"),
+            ("old mac\rline", "old mac\nline"),
+            ("mixed\r\n\r\rend", "mixed\n\n\nend"),
+        ],
+        ids=["lf", "crlf", "cr", "mixed"],
+    )
+    def test_translate_newlines(self, text, expected):
+        """Test that CRLF and bare CR line endings become a single newline."""
+        assert translate_newlines(text) == expected